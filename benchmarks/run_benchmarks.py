@@ -0,0 +1,241 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+file_path = Path(__file__).parent.resolve()
+sys.path.append(str(file_path.parent))
+
+from src.greeks.calculate_greeks import (
+    calculate_greek_surfaces,
+    calculate_greeks_black_scholes,
+    calculate_greeks_monte_carlo
+)
+from src.models.backend import BACKENDS, get_backend, set_backend
+from src.models.black_scholes import black_scholes, black_scholes_vectorized
+from src.models.cache import clear_caches
+from src.models.lattice import lattice_option
+from src.models.monte_carlo import monte_carlo_distribution, monte_carlo_simulation, simulate_option_value_paths
+from src.models.path_dependent import asian_option, barrier_option
+
+# Baselines are machine-specific, so none is committed: record one with --save-baseline on the machine
+# that runs the gate. An explicit --threshold turns a missing baseline into an error
+DEFAULT_BASELINE = file_path / 'baseline.json'
+DEFAULT_THRESHOLD = 20.0
+
+# Default page inputs (the sidebar defaults in UserInput)
+PARAMETERS = dict(option_type='Call', S=105.0, K=100.0, T=1.0, r=0.05, sigma=0.2, q=0.015)
+
+def _uncached(func):
+
+    # Benchmarks measure the computation itself, never a cache hit
+    return getattr(func, '__wrapped__', func)
+
+def bench_scalar_pricing(n=10_000):
+    p = PARAMETERS
+    strikes = np.linspace(50, 150, n)
+    for K in strikes:
+        black_scholes(p['option_type'], p['S'], K, p['T'], p['r'], p['sigma'], p['q'])
+    return n, 'prices/s'
+
+def bench_batch_pricing(n=100_000):
+    p = PARAMETERS
+    black_scholes_vectorized(p['option_type'], p['S'], np.linspace(50, 150, n), p['T'], p['r'], p['sigma'], p['q'])
+    return n, 'prices/s'
+
+def make_mc_bench(num_simulations, sampling='exact'):
+    def bench():
+        p = PARAMETERS
+        _uncached(monte_carlo_simulation)(p['option_type'], p['S'], p['K'], p['T'], p['r'], p['sigma'], p['q'],
+                                          num_simulations, sampling=sampling, seed=1)
+        return num_simulations, 'paths/s'
+    return bench
+
+def bench_greeks_black_scholes():
+    p = PARAMETERS
+    _uncached(calculate_greeks_black_scholes)(*p.values())
+    return 1, 'tables/s'
+
+def bench_greeks_monte_carlo(num_simulations=10_000):
+    p = PARAMETERS
+    _uncached(calculate_greeks_monte_carlo)(*p.values(), num_simulations, seed=1)
+    return 1, 'tables/s'
+
+def make_surface_bench(resolution):
+    def bench():
+        _uncached(calculate_greek_surfaces)(*PARAMETERS.values(), resolution, 'float32')
+        return 5 * resolution ** 2, 'points/s'
+    return bench
+
+def make_lattice_bench(num_strikes):
+    def bench():
+        p = PARAMETERS
+        strikes = np.linspace(80, 120, num_strikes) if num_strikes > 1 else p['K']
+        _uncached(lattice_option)('Put', p['S'], strikes, p['T'], p['r'], p['sigma'], p['q'])
+        return num_strikes, 'options/s'
+    return bench
+
+def bench_asian(num_simulations=100_000):
+    p = PARAMETERS
+    asian_option(*p.values(), num_simulations, seed=1)
+    return num_simulations, 'paths/s'
+
+def bench_barrier(num_simulations=100_000):
+    p = PARAMETERS
+    barrier_option(*p.values(), barrier=0.9 * p['S'], num_simulations=num_simulations, seed=1)
+    return num_simulations, 'paths/s'
+
+def bench_page_compute(num_simulations=10_000, seed=42):
+
+    # Everything main.main() computes for one render with default inputs, without drawing anything
+    clear_caches()
+    p = PARAMETERS
+    option_type, S, K, T, r, sigma, q = p.values()
+    black_scholes(option_type, S, K, T, r, sigma, q)
+    monte_carlo_distribution(option_type, S, K, T, r, sigma, q, num_simulations, seed)
+    for sweep_sigma in np.linspace(0.1, 1.0, 10):
+        black_scholes(option_type, S, K, T, r, sweep_sigma, q)
+        monte_carlo_simulation(option_type, S, K, T, r, sweep_sigma, q, num_simulations, seed=seed)
+    for sweep_T in np.linspace(0.01, 1.0, 10):
+        black_scholes(option_type, S, K, sweep_T, r, sigma, q)
+        monte_carlo_simulation(option_type, S, K, sweep_T, r, sigma, q, num_simulations, seed=seed)
+    for sweep_K in np.linspace(S * 0.5, S * 1.5, 10):
+        black_scholes(option_type, S, sweep_K, T, r, sigma, q)
+        monte_carlo_simulation(option_type, S, sweep_K, T, r, sigma, q, num_simulations, seed=seed)
+    simulate_option_value_paths(option_type, S, K, T, r, sigma, q, 10, seed=seed)
+    for _ in range(12):
+        calculate_greeks_black_scholes(option_type, S, K, T, r, sigma, q)
+        calculate_greeks_monte_carlo(option_type, S, K, T, r, sigma, q, num_simulations, seed=seed)
+    calculate_greek_surfaces(option_type, S, K, T, r, sigma, q, 100, 'float32')
+    return 1, 'pages/s'
+
+BENCHMARKS = {
+    'pricing.scalar_10k': bench_scalar_pricing,
+    'pricing.batch_100k': bench_batch_pricing,
+    'monte_carlo.exact_10k': make_mc_bench(10_000),
+    'monte_carlo.exact_100k': make_mc_bench(100_000),
+    'monte_carlo.exact_1m': make_mc_bench(1_000_000),
+    'monte_carlo.stepped_10k': make_mc_bench(10_000, 'stepped'),
+    'greeks.black_scholes_table': bench_greeks_black_scholes,
+    'greeks.monte_carlo_table_10k': bench_greeks_monte_carlo,
+    'lattice.american_1': make_lattice_bench(1),
+    'lattice.american_strip_50': make_lattice_bench(50),
+    'path_dependent.asian_100k': bench_asian,
+    'path_dependent.barrier_100k': bench_barrier,
+    'surface.50x50': make_surface_bench(50),
+    'surface.400x400': make_surface_bench(400),
+    'page.compute': bench_page_compute,
+}
+
+def run_benchmark(bench, repeat):
+
+    # Warm up once (lazy imports, allocator), then time each repeat and keep the median
+    bench()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        units, unit = bench()
+        timings.append(time.perf_counter() - start)
+    wall_time = statistics.median(timings)
+
+    # Peak memory from a separate traced run so tracing overhead does not skew the timings
+    tracemalloc.start()
+    bench()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'wall_time_s': wall_time,
+        'min_wall_time_s': min(timings),
+        'peak_memory_bytes': peak,
+        'throughput': units / wall_time if wall_time > 0 else float('inf'),
+        'unit': unit,
+        'repeat': repeat,
+    }
+
+def compare(results, baseline, threshold):
+
+    # A benchmark regresses when its median wall time is more than threshold percent above the baseline
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get('results', {}).get(name)
+        if reference is None:
+            print(f'{name} is not in the baseline; not compared')
+            continue
+        change = (result['wall_time_s'] / reference['wall_time_s'] - 1) * 100
+        result['baseline_wall_time_s'] = reference['wall_time_s']
+        result['change_pct'] = change
+        if change > threshold:
+            regressions.append((name, change))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark pricing, Greeks, Monte Carlo and surface generation.')
+    parser.add_argument('-o', '--output', default=None, help='write results as JSON to this file')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='baseline JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the new baseline')
+    parser.add_argument('--threshold', type=float, default=None,
+                        help=f'allowed slowdown in percent before failing (default {DEFAULT_THRESHOLD:.0f}); '
+                             'fails when there is no baseline to compare against')
+    parser.add_argument('--repeat', type=int, default=5, help='timed repetitions per benchmark')
+    parser.add_argument('--backend', choices=BACKENDS, default=None, help='numeric backend to benchmark')
+    parser.add_argument('--only', nargs='*', default=None, help='benchmark names (or prefixes) to run')
+    args = parser.parse_args(argv)
+    if args.backend is not None:
+        set_backend(args.backend)
+
+    selected = {name: bench for name, bench in BENCHMARKS.items()
+                if not args.only or any(name.startswith(prefix) for prefix in args.only)}
+    results = {}
+    for name, bench in selected.items():
+        results[name] = run_benchmark(bench, args.repeat)
+        r = results[name]
+        print(f"{name:32s} {r['wall_time_s'] * 1000:10.2f} ms  {r['peak_memory_bytes'] / 1024 ** 2:8.1f} MiB  "
+              f"{r['throughput']:14,.0f} {r['unit']}")
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'backend': get_backend().name,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+        },
+        'results': results,
+    }
+
+    regressions = []
+    status = 0
+    threshold = DEFAULT_THRESHOLD if args.threshold is None else args.threshold
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2))
+        print(f'Baseline saved to {baseline_path}')
+    elif baseline_path.exists():
+        regressions = compare(results, json.loads(baseline_path.read_text()), threshold)
+        for name, change in regressions:
+            print(f'REGRESSION {name}: {change:+.1f}% slower than baseline (threshold {threshold:.0f}%)')
+        if not regressions:
+            print(f'No regressions beyond {threshold:.0f}% against {baseline_path}')
+        status = 1 if regressions else 0
+    elif args.threshold is not None:
+        # Asked to gate, but there is nothing to gate against: fail rather than pass vacuously
+        print(f'ERROR: no baseline at {baseline_path}; run with --save-baseline first', file=sys.stderr)
+        status = 2
+    else:
+        print(f'No baseline at {baseline_path}; run with --save-baseline to create one')
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+    return status
+
+if __name__ == '__main__':
+    sys.exit(main())
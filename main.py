@@ -1,3 +1,4 @@
+import os
 import streamlit as st
 import sys
 from pathlib import Path
@@ -11,7 +12,8 @@ from src.visualisations.general_plots import (
     plot_time_to_expiration_sensitivity,
     plot_strike_price_sensitivity,
     animate_monte_carlo_simulation,
-    plot_histogram_of_simulated_prices
+    plot_histogram_of_simulated_prices,
+    plot_monte_carlo_convergence
 )
 from src.greeks.greeks_analysis import get_user_parameters, analyze_greeks
 from src.visualisations.greeks_plots import (
@@ -19,7 +21,84 @@ from src.visualisations.greeks_plots import (
     plot_second_order_greek,
     create_volatility_surface
 )
+from src.visualisations.session_jobs import cancel_session_job
 from src.visualisations.styling import render_header
+from src.utils import instrumentation
+
+def _unpack(parameters):
+    return (parameters['option_type'], parameters['underlying_price'], parameters['strike_price'],
+            parameters['time_to_expiration'], parameters['risk_free_rate'], parameters['volatility'],
+            parameters['dividend_yield'])
+
+@st.fragment
+def price_comparison_section(parameters):
+    if st.toggle("Show price comparison", value=True, key="show_price_comparison"):
+        option_type, S, K, T, r, sigma, q = _unpack(parameters)
+        with instrumentation.section("Price comparison"):
+            plot_price_comparison(S, K, T, r, sigma, option_type, q=q, num_simulations=parameters['num_simulations'],
+                                  seed=parameters['seed'])
+
+@st.fragment
+def sensitivity_section(parameters):
+    if st.toggle("Show sensitivity plots", value=False, key="show_sensitivity"):
+        option_type, S, K, T, r, sigma, q = _unpack(parameters)
+        seed = parameters['seed']
+        with instrumentation.section("Volatility sensitivity"):
+            plot_volatility_sensitivity(S, K, T, r, option_type, seed=seed)
+        with instrumentation.section("Time to expiration sensitivity"):
+            plot_time_to_expiration_sensitivity(S, K, r, sigma, option_type, seed=seed)
+        with instrumentation.section("Strike price sensitivity"):
+            plot_strike_price_sensitivity(S, T, r, sigma, option_type, seed=seed)
+
+@st.fragment
+def path_simulation_section(parameters):
+    if st.toggle("Show simulated price paths", value=False, key="show_paths"):
+        option_type, S, K, T, r, sigma, q = _unpack(parameters)
+        with instrumentation.section("Monte Carlo animation"):
+            animate_monte_carlo_simulation(option_type, S, K, T, r, sigma, q=q)
+
+@st.fragment
+def histogram_section(parameters):
+    if st.toggle("Show payoff distribution", value=False, key="show_histogram"):
+        option_type, S, K, T, r, sigma, q = _unpack(parameters)
+        with instrumentation.section("Payoff histogram"):
+            plot_histogram_of_simulated_prices(option_type, S, K, T, r, sigma, q=q,
+                                               num_simulations=parameters['num_simulations'], seed=parameters['seed'])
+
+# The chart refines from a background run and only polls while that run is going; closing the section
+# cancels it
+@st.fragment
+def convergence_section(parameters):
+    if st.toggle("Show live convergence", value=False, key="show_convergence"):
+        option_type, S, K, T, r, sigma, q = _unpack(parameters)
+        plot_monte_carlo_convergence(option_type, S, K, T, r, sigma, q=q, seed=parameters['seed'])
+    else:
+        cancel_session_job('convergence')
+
+@st.fragment
+def greeks_table_section(parameters):
+    if st.toggle("Show Greeks comparison", value=True, key="show_greeks_table"):
+        with instrumentation.section("Greeks tables"):
+            analyze_greeks(parameters)
+
+@st.fragment
+def greek_plots_section(parameters, greeks, plot_greek):
+    if st.toggle("Show plots", value=False, key=f"show_{plot_greek.__name__}"):
+        option_type, S, K, T, r, sigma, q = _unpack(parameters)
+        for greek in greeks:
+            with instrumentation.section(f"{greek} plot"):
+                plot_greek(greek, S, K, T, r, sigma, option_type, q=q, num_simulations=parameters['num_simulations'],
+                           seed=parameters['seed'])
+
+@st.fragment
+def surface_section(parameters):
+    if st.toggle("Show Greek surfaces", value=False, key="show_surface"):
+        option_type, S, K, T, r, sigma, q = _unpack(parameters)
+        surface_resolution = st.select_slider("Surface resolution", options=[50, 100, 200, 400], value=100)
+        with instrumentation.section("Greek surface"):
+            BS_volatility_surface_fig = create_volatility_surface(option_type, S, K, T, r, sigma, q,
+                                                                  resolution=surface_resolution, dtype="float32")
+            st.plotly_chart(BS_volatility_surface_fig)
 
 def main():
     # Set page config
@@ -32,43 +111,43 @@ def main():
     
     parameters = get_user_parameters()
 
-    S = parameters['underlying_price']
-    K = parameters['strike_price']
-    T = parameters['time_to_expiration']
-    r = parameters['risk_free_rate']
-    sigma = parameters['volatility']
-    q = parameters['dividend_yield']
-    option_type = parameters['option_type']
-    num_simulations = parameters['num_simulations']
+    # Opt-in per-section timings, recorded per browser session; the environment flag sets the default
+    # for the checkbox
+    recorder = instrumentation.session_recorder()
+    if st.sidebar.checkbox("Show timing panel", value=recorder.enabled):
+        instrumentation.enable()
+        instrumentation.reset()
+    else:
+        instrumentation.disable()
 
+    # Each section is a fragment behind a toggle: it only computes once opened, its own widgets (and the
+    # toggle) rerun just that section, and its figures are cached in session state keyed by its inputs.
+    # Monte Carlo estimates run in background jobs, so sections show partial results as they refine
     st.header("Option Pricing Model Comparison")
-    
-    plot_price_comparison(S, K, T, r, sigma, option_type)
-    plot_volatility_sensitivity(S, K, T, r, option_type)
-    plot_time_to_expiration_sensitivity(S, K, r, sigma, option_type)
-    plot_strike_price_sensitivity(S, T, r, sigma, option_type)
-    animate_monte_carlo_simulation(option_type, S, K, T, r, sigma, q=q)
-    plot_histogram_of_simulated_prices(option_type, S, K, T, r, sigma, q=q, num_simulations=num_simulations)
+    price_comparison_section(parameters)
+    sensitivity_section(parameters)
+    path_simulation_section(parameters)
+    histogram_section(parameters)
+    convergence_section(parameters)
 
     st.header("Greeks Analysis")
-    analyze_greeks(parameters)  
+    greeks_table_section(parameters)
 
     st.header("First Order Greeks Plots")
-    
-    first_order_greeks = ['Delta', 'Gamma', 'Theta', 'Vega', 'Rho']
-    for greek in first_order_greeks:
-        plot_first_order_greek(greek, S, K, T, r, sigma, option_type, q=q, num_simulations=num_simulations)
+    greek_plots_section(parameters, ['Delta', 'Gamma', 'Theta', 'Vega', 'Rho'], plot_first_order_greek)
 
     st.header("Second Order Greeks Plots")
+    greek_plots_section(parameters, ['Charm', 'Speed', 'Color', 'Zomma', 'Veta', 'Volga'], plot_second_order_greek)
 
-    second_order_greeks = ['Charm', 'Speed', 'Color', 'Zomma', 'Veta', 'Volga']
-    for greek in second_order_greeks:
-        plot_second_order_greek(greek, S, K, T, r, sigma, option_type, q=q, num_simulations=num_simulations)
-    
-    st.subheader(f"Black-Scholes {option_type} Option Greeks: Multi-Dimensional Sensitivity Plots")
+    st.subheader(f"Black-Scholes {parameters['option_type']} Option Greeks: Multi-Dimensional Sensitivity Plots")
+    surface_section(parameters)
 
-    BS_volatility_surface_fig = create_volatility_surface(option_type, S, K, T, r, sigma, q)
-    st.plotly_chart(BS_volatility_surface_fig)
+    # Timing panel and optional export (OPTIONS_INSTRUMENTATION_OUTPUT=page.json or page.prom)
+    if instrumentation.is_enabled():
+        instrumentation.render_sidebar_panel()
+        output = os.environ.get(instrumentation.ENV_OUTPUT)
+        if output:
+            instrumentation.export(output)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
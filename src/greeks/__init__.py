@@ -1,4 +1,10 @@
-from .calculate_greeks import calculate_greeks_black_scholes, calculate_greeks_monte_carlo
-from .greeks_analysis import analyze_greeks
+from .calculate_greeks import calculate_greeks_black_scholes, calculate_greeks_monte_carlo, black_scholes_greeks, monte_carlo_greeks, GreeksResult
 
-__all__ = ['calculate_greeks_black_scholes', 'calculate_greeks_monte_carlo', 'get_user_parameters', 'analyze_greeks']
\ No newline at end of file
+__all__ = ['calculate_greeks_black_scholes', 'calculate_greeks_monte_carlo', 'black_scholes_greeks', 'monte_carlo_greeks', 'GreeksResult', 'get_user_parameters', 'analyze_greeks']
+
+# The Streamlit/pandas analysis page is loaded on first access so the Greeks engine imports with NumPy only
+def __getattr__(name):
+    if name in ('get_user_parameters', 'analyze_greeks'):
+        from . import greeks_analysis
+        return getattr(greeks_analysis, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,150 +1,236 @@
 import numpy as np
-from src.models.black_scholes import black_scholes
-from src.models.monte_carlo import monte_carlo_simulation
+from src.models.black_scholes import option_type_mask
+from src.models.cache import memoize
+from src.models.distributions import norm_cdf, norm_pdf
+from src.models.random_pool import standard_normals
+from src.utils import instrumentation
+
+FIRST_ORDER_GREEKS = ['Delta', 'Gamma', 'Theta', 'Vega', 'Rho']
+SECOND_ORDER_GREEKS = ['Charm', 'Speed', 'Color', 'Zomma', 'Veta', 'Volga', 'Vanna']
+
+class GreeksResult:
+    # Columnar container: each attribute holds a float or an ndarray with the broadcast input shape
+    __slots__ = ('price', 'delta', 'gamma', 'theta', 'vega', 'rho',
+                 'charm', 'speed', 'color', 'zomma', 'veta', 'volga', 'vanna')
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values[name])
+
+    def first_order(self):
+        return {greek: getattr(self, greek.lower()) for greek in FIRST_ORDER_GREEKS}
+
+    def second_order(self):
+        return {greek: getattr(self, greek.lower()) for greek in SECOND_ORDER_GREEKS}
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'GreeksResult({fields})'
+
+def black_scholes_greeks(option_type, S, K, T, r, sigma, q=0):
+
+    # Broadcast inputs so scalars, strips and grids all go through the same pass
+    is_call, S, K, T, r, sigma, q = np.broadcast_arrays(
+        option_type_mask(option_type),
+        *(np.asarray(x, dtype=float) for x in (S, K, T, r, sigma, q))
+    )
+
+    # Input validation
+    if np.any((S <= 0) | (K <= 0) | (T <= 0)):
+        raise ValueError("S, K, and T must be greater than zero.")
+    if np.any(sigma < 0):
+        raise ValueError("Volatility (sigma) must be non-negative.")
+    instrumentation.count('black_scholes_calls')
+
+    # Shared terms: d1/d2, discount factors, the pdf and the signed cdfs are evaluated once
+    sign = np.where(is_call, 1.0, -1.0)
+    sqrt_T = np.sqrt(T)
+    sigma_sqrt_T = sigma * sqrt_T
+    d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / sigma_sqrt_T
+    d2 = d1 - sigma_sqrt_T
+    dividend_discount = np.exp(-q * T)
+    rate_discount = np.exp(-r * T)
+    pdf_d1 = norm_pdf(d1)
+    cdf_d1 = norm_cdf(sign * d1)
+    cdf_d2 = norm_cdf(sign * d2)
+
+    price = sign * (S * dividend_discount * cdf_d1 - K * rate_discount * cdf_d2)
+
+    # First-order Greeks (theta and the other time Greeks are per year of calendar time, i.e. -d/dT)
+    delta = sign * dividend_discount * cdf_d1
+    gamma = dividend_discount * pdf_d1 / (S * sigma_sqrt_T)
+    vega = S * dividend_discount * pdf_d1 * sqrt_T
+    theta = (-S * dividend_discount * pdf_d1 * sigma / (2 * sqrt_T)
+             - sign * r * K * rate_discount * cdf_d2
+             + sign * q * S * dividend_discount * cdf_d1)
+    rho = sign * K * T * rate_discount * cdf_d2
 
-def calculate_greeks_black_scholes(option_type, S, K, T, r, sigma, q=0):
-    
-    # Calculate option price for the current price
-    price_current = black_scholes(option_type, S, K, T, r, sigma, q)
-
-    # First-order Greeks
-    price_up = black_scholes(option_type, S + 0.01, K, T, r, sigma, q)
-    price_down = black_scholes(option_type, S - 0.01, K, T, r, sigma, q)
-    delta = (price_up - price_down) / 0.02
+    # Second-order Greeks
+    drift_term = (2 * (r - q) * T - d2 * sigma_sqrt_T) / (2 * T * sigma_sqrt_T)
+    charm = sign * q * dividend_discount * cdf_d1 - dividend_discount * pdf_d1 * drift_term
+    speed = -gamma / S * (d1 / sigma_sqrt_T + 1)
+    color = gamma / (2 * T) * (2 * q * T + 1 + 2 * T * drift_term * d1)
+    zomma = gamma * (d1 * d2 - 1) / sigma
+    veta = vega * (q + (r - q) * d1 / sigma_sqrt_T - (1 + d1 * d2) / (2 * T))
+    volga = vega * d1 * d2 / sigma
+    vanna = -dividend_discount * pdf_d1 * d2 / sigma
 
-    gamma = (price_up - 2 * price_current + price_down) / (0.01 ** 2)
+    values = dict(price=price, delta=delta, gamma=gamma, theta=theta, vega=vega, rho=rho,
+                  charm=charm, speed=speed, color=color, zomma=zomma, veta=veta, volga=volga, vanna=vanna)
 
-    price_t_plus = black_scholes(option_type, S, K, T + 1/365, r, sigma, q)
-    theta = (price_t_plus - price_current) * 365  # Annualize
+    # Hand back plain floats for scalar inputs
+    if price.ndim == 0:
+        values = {name: float(value) for name, value in values.items()}
 
-    price_vol_up = black_scholes(option_type, S, K, T, r, sigma + 0.01, q)
-    price_vol_down = black_scholes(option_type, S, K, T, r, sigma - 0.01, q)
-    vega = (price_vol_up - price_vol_down) / 0.02
+    return GreeksResult(**values)
 
-    price_r_up = black_scholes(option_type, S, K, T, r + 0.01, sigma, q)
-    price_r_down = black_scholes(option_type, S, K, T, r - 0.01, sigma, q)
-    rho = (price_r_up - price_r_down) / 0.02
+@memoize(maxsize=256)
+def calculate_greeks_black_scholes(option_type, S, K, T, r, sigma, q=0):
 
-    # Second-order Greeks
-    charm = (black_scholes(option_type, S, K, T - 1/365, r, sigma, q) - price_current) / (1/365)
-    speed = (black_scholes(option_type, S + 0.01, K, T, r, sigma, q) - 2 * price_current + black_scholes(option_type, S - 0.01, K, T, r, sigma, q)) / (0.01 ** 2)
-    color = (black_scholes(option_type, S, K, T - 1/365, r, sigma, q) - price_current) / (1/365)
-    zomma = (price_vol_up - 2 * price_current + price_vol_down) / (0.01 ** 2)
-    veta = (black_scholes(option_type, S, K, T + 1/365, r, sigma, q) - price_current) / (1/365)
-    volga = (price_vol_up - 2 * price_current + price_vol_down) / (0.01 ** 2)
+    # Single closed-form pass for the price and all twelve Greeks
+    greeks = black_scholes_greeks(option_type, S, K, T, r, sigma, q)
 
     # Return the Greeks as separate dictionaries
-    first_order_greeks = {
-        'Delta': delta,
-        'Gamma': gamma,
-        'Theta': theta,
-        'Vega': vega,
-        'Rho': rho
+    return greeks.first_order(), greeks.second_order()
+
+SURFACE_GREEKS = ['Delta', 'Gamma', 'Theta', 'Vega', 'Rho']
+
+@memoize(maxsize=16, max_bytes=256 * 1024 ** 2)
+def calculate_greek_surfaces(option_type, S, K, T, r, sigma, q=0, resolution=50, dtype="float64"):
+
+    # Axes of the three surface families: (stock price, volatility), (time, stock price), (rate, stock price)
+    stock_prices = np.linspace(S * 0.5, S * 1.5, resolution)
+    volatilities = np.linspace(max(0.01, sigma * 0.5), sigma * 1.5, resolution)
+    times = np.linspace(0.1, T * 2, resolution)
+    rates = np.linspace(max(0.01, r * 0.5), r * 1.5, resolution)
+
+    # Stack the three meshgrids into one (3, resolution, resolution) batch so every Greek on every
+    # surface comes out of a single broadcast pass; rows index the y-axis and columns the x-axis
+    ones = np.ones((resolution, resolution))
+    stock_by_volatility, volatility_grid = np.meshgrid(stock_prices, volatilities)
+    time_grid, stock_by_time = np.meshgrid(times, stock_prices)
+    rate_grid, stock_by_rate = np.meshgrid(rates, stock_prices)
+    greeks = black_scholes_greeks(
+        option_type,
+        np.stack([stock_by_volatility, stock_by_time, stock_by_rate]),
+        K,
+        np.stack([T * ones, time_grid, T * ones]),
+        np.stack([r * ones, r * ones, rate_grid]),
+        np.stack([volatility_grid, sigma * ones, sigma * ones]),
+        q,
+    )
+
+    layouts = {
+        'Delta': (0, stock_prices, volatilities, 'Stock Price', 'Volatility'),
+        'Gamma': (0, stock_prices, volatilities, 'Stock Price', 'Volatility'),
+        'Vega': (0, stock_prices, volatilities, 'Stock Price', 'Volatility'),
+        'Theta': (1, times, stock_prices, 'Time to Expiration', 'Stock Price'),
+        'Rho': (2, rates, stock_prices, 'Risk-Free Rate', 'Stock Price'),
     }
-
-    second_order_greeks = {
-        'Charm': charm,
-        'Speed': speed,
-        'Color': color,
-        'Zomma': zomma,
-        'Veta': veta,
-        'Volga': volga
+    greek_surfaces = {}
+    for greek in SURFACE_GREEKS:
+        panel, x_param, y_param, x_title, y_title = layouts[greek]
+        greek_surfaces[greek] = {
+            'z': getattr(greeks, greek.lower())[panel].astype(dtype),
+            'x': x_param.astype(dtype),
+            'y': y_param.astype(dtype),
+            'x_title': x_title,
+            'y_title': y_title
+        }
+    return greek_surfaces
+
+def monte_carlo_greeks(option_type, S, K, T, r, sigma, q=0, num_simulations=10000, random_numbers=None, seed=None):
+
+    # Broadcast contract parameters; the trailing axis added below indexes the simulated paths
+    is_call, S, K, T, r, sigma, q = np.broadcast_arrays(
+        option_type_mask(option_type),
+        *(np.asarray(x, dtype=float) for x in (S, K, T, r, sigma, q))
+    )
+
+    # Input validation
+    if np.any((S <= 0) | (K <= 0) | (T <= 0)):
+        raise ValueError("S, K, and T must be greater than zero.")
+    if np.any(sigma <= 0):
+        raise ValueError("Volatility (sigma) must be greater than zero for Monte Carlo Greeks.")
+    if num_simulations <= 1:
+        raise ValueError("Number of simulations must be an integer greater than one.")
+    instrumentation.count('monte_carlo_simulation_calls')
+    instrumentation.count('simulated_paths', num_simulations)
+
+    # One set of terminal draws is shared by the price and every Greek
+    if random_numbers is None:
+        random_numbers = standard_normals(seed, num_simulations)
+    if random_numbers.shape != (num_simulations,):
+        raise ValueError(f"random_numbers must have shape ({num_simulations},)")
+
+    sign, S, K, T, r, sigma, q = (x[..., None] for x in (np.where(is_call, 1.0, -1.0), S, K, T, r, sigma, q))
+    Z = random_numbers
+    s = sigma * np.sqrt(T)
+    terminal = S * np.exp((r - q - 0.5 * sigma ** 2) * T + s * Z)
+    payoff = np.maximum(sign * (terminal - K), 0)
+
+    # With m = E[log S_T] and s its std, V = D * F(m, s) and dF/ds = s * d2F/dm2, so every Greek is a
+    # combination of M0 = E[payoff] and Mk = d^(k-1)F/dm^(k-1): M1 is the pathwise delta integrand and
+    # M2..M4 add Hermite likelihood-ratio weights to it
+    pathwise = np.where(payoff > 0, sign * terminal, 0.0)
+    moments = np.stack([
+        payoff,
+        pathwise,
+        pathwise * Z / s,
+        pathwise * (Z ** 2 - 1) / s ** 2,
+        pathwise * (Z ** 3 - 3 * Z) / s ** 3,
+    ], axis=-2)
+    del payoff, pathwise, terminal
+
+    # Per-contract coefficients of each Greek on (M0, ..., M4)
+    S, T, r, sigma, q = (x[..., 0] for x in (S, T, r, sigma, q))
+    D = np.exp(-r * T)
+    mu = r - q - 0.5 * sigma ** 2
+    a = 0.5 * sigma ** 2
+    zero = np.zeros_like(D)
+    vega_scale = D * sigma * T
+    coefficients = {
+        'price': (D, zero, zero, zero, zero),
+        'delta': (zero, D / S, zero, zero, zero),
+        'gamma': (zero, -D / S ** 2, D / S ** 2, zero, zero),
+        'theta': (r * D, -mu * D, -a * D, zero, zero),
+        'vega': (zero, -vega_scale, vega_scale, zero, zero),
+        'rho': (-D * T, D * T, zero, zero, zero),
+        'charm': (zero, r * D / S, -mu * D / S, -a * D / S, zero),
+        'speed': (zero, 2 * D / S ** 3, -3 * D / S ** 3, D / S ** 3, zero),
+        'color': (zero, -r * D / S ** 2, (r + mu) * D / S ** 2, (a - mu) * D / S ** 2, -a * D / S ** 2),
+        'zomma': (zero, zero, vega_scale / S ** 2, -2 * vega_scale / S ** 2, vega_scale / S ** 2),
+        'veta': (zero, D * sigma - r * vega_scale, r * vega_scale - D * sigma + mu * vega_scale,
+                 (a - mu) * vega_scale, -a * vega_scale),
+        'volga': (zero, -D * T, D * T + vega_scale * sigma * T, -2 * vega_scale * sigma * T, vega_scale * sigma * T),
+        'vanna': (zero, zero, -vega_scale / S, vega_scale / S, zero),
     }
+    weights = np.stack([np.stack(np.broadcast_arrays(*c), axis=-1) for c in coefficients.values()], axis=-2)
 
-    return first_order_greeks, second_order_greeks
-
-def calculate_greeks_monte_carlo(option_type, S, K, T, r, sigma, q=0, num_simulations=10000):
-
-    # Generate random numbers once to use across all simulations
-    random_numbers = np.random.normal(size=(num_simulations, 365))
-    # Calculate option price for the current price
-    price_current = monte_carlo_simulation(option_type, S, K, T, r, sigma, q, num_simulations, random_numbers)
-    
-    # Step sizes for finite differences
-    h_s = S * 0.001      # 0.1% of spot price
-    h_v = sigma * 0.01  # 1% of volatility
-    h_r = max(0.001, r * 0.001)  # 0.1% of rate
-    h_t = 1/12          # One month instead of one day
-
-    # First-order Greeks
-    # Delta calculation
-    price_up = monte_carlo_simulation(option_type, S + h_s, K, T, r, sigma, q, num_simulations, random_numbers)
-    price_down = monte_carlo_simulation(option_type, S - h_s, K, T, r, sigma, q, num_simulations, random_numbers)
-    delta = (price_up - price_down) / (2 * h_s)
-
-    # Gamma calculation
-    gamma = (price_up - 2 * price_current + price_down) / (h_s ** 2)
-
-    # Theta calculation (forward difference to avoid negative time)
-    price_t_plus = monte_carlo_simulation(option_type, S, K, T + h_t, r, sigma, q, num_simulations, random_numbers)
-    theta = (price_t_plus - price_current) / h_t
-
-    # Vega calculation
-    price_vol_up = monte_carlo_simulation(option_type, S, K, T, r, sigma + h_v, q, num_simulations, random_numbers)
-    price_vol_down = monte_carlo_simulation(option_type, S, K, T, r, sigma - h_v, q, num_simulations, random_numbers)
-    vega = (price_vol_up - price_vol_down) / (2 * h_v)
-
-    # Rho calculation
-    price_r_up = monte_carlo_simulation(option_type, S, K, T, r + h_r, sigma, q, num_simulations, random_numbers)
-    price_r_down = monte_carlo_simulation(option_type, S, K, T, r - h_r, sigma, q, num_simulations, random_numbers)
-    rho = (price_r_up - price_r_down) / (2 * h_r)
-
-    # Second-order Greeks using same random numbers
-    
-    # Charm (rate of change of delta with respect to time)
-    price_up_dt = monte_carlo_simulation(option_type, S + h_s, K, T + h_t, r, sigma, q, num_simulations, random_numbers)
-    price_down_dt = monte_carlo_simulation(option_type, S - h_s, K, T + h_t, r, sigma, q, num_simulations, random_numbers)
-    delta_dt = (price_up_dt - price_down_dt) / (2 * h_s)
-    charm = (delta_dt - delta) / h_t
-
-    # Speed (rate of change of gamma with respect to stock price)
-    price_up_2h = monte_carlo_simulation(option_type, S + 2*h_s, K, T, r, sigma, q, num_simulations, random_numbers)
-    price_down_2h = monte_carlo_simulation(option_type, S - 2*h_s, K, T, r, sigma, q, num_simulations, random_numbers)
-    gamma_up = (price_up_2h - 2*price_up + price_current) / (h_s ** 2)
-    gamma_down = (price_current - 2*price_down + price_down_2h) / (h_s ** 2)
-    speed = (gamma_up - gamma_down) / (2 * h_s)
-
-    # Color (rate of change of gamma with respect to time)
-    price_up_dt = monte_carlo_simulation(option_type, S + h_s, K, T + h_t, r, sigma, q, num_simulations, random_numbers)
-    price_down_dt = monte_carlo_simulation(option_type, S - h_s, K, T + h_t, r, sigma, q, num_simulations, random_numbers)
-    price_dt = monte_carlo_simulation(option_type, S, K, T + h_t, r, sigma, q, num_simulations, random_numbers)
-    gamma_dt = (price_up_dt - 2*price_dt + price_down_dt) / (h_s ** 2)
-    color = (gamma_dt - gamma) / h_t
-
-    # Zomma (rate of change of gamma with respect to volatility)
-    price_up_vol = monte_carlo_simulation(option_type, S + h_s, K, T, r, sigma + h_v, q, num_simulations, random_numbers)
-    price_down_vol = monte_carlo_simulation(option_type, S - h_s, K, T, r, sigma + h_v, q, num_simulations, random_numbers)
-    gamma_up_vol = (price_up_vol - 2*price_vol_up + price_down_vol) / (h_s ** 2)
-    gamma_down_vol = (price_up - 2*price_current + price_down) / (h_s ** 2)
-    zomma = (gamma_up_vol - gamma_down_vol) / (2 * h_v)
-
-    # Veta (rate of change of vega with respect to time)
-    price_vol_up_dt = monte_carlo_simulation(option_type, S, K, T + h_t, r, sigma + h_v, q, num_simulations, random_numbers)
-    price_vol_down_dt = monte_carlo_simulation(option_type, S, K, T + h_t, r, sigma - h_v, q, num_simulations, random_numbers)
-    vega_dt = (price_vol_up_dt - price_vol_down_dt) / (2 * h_v)
-    veta = (vega_dt - vega) / h_t
-
-    # Volga (rate of change of vega with respect to volatility)
-    price_2vol_up = monte_carlo_simulation(option_type, S, K, T, r, sigma + 2*h_v, q, num_simulations, random_numbers)
-    price_2vol_down = monte_carlo_simulation(option_type, S, K, T, r, sigma - 2*h_v, q, num_simulations, random_numbers)
-    vega_up = (price_2vol_up - price_vol_up) / h_v
-    vega_down = (price_vol_down - price_2vol_down) / h_v
-    volga = (vega_up - vega_down) / (2 * h_v)
+    # Estimates and standard errors from the sample mean and covariance of the moments
+    mean = moments.mean(axis=-1)
+    centred = moments - mean[..., None]
+    covariance = np.einsum('...in,...jn->...ij', centred, centred) / (num_simulations - 1)
+    estimates = np.einsum('...gi,...i->...g', weights, mean)
+    variances = np.einsum('...gi,...ij,...gj->...g', weights, covariance, weights)
+    std_errors = np.sqrt(np.maximum(variances, 0) / num_simulations)
+
+    def to_result(values):
+        columns = {name: values[..., i] for i, name in enumerate(coefficients)}
+        if values.ndim == 1:
+            columns = {name: float(value) for name, value in columns.items()}
+        return GreeksResult(**columns)
+
+    return to_result(estimates), to_result(std_errors)
+
+@memoize(maxsize=64)
+def calculate_greeks_monte_carlo(option_type, S, K, T, r, sigma, q=0, num_simulations=10000, seed=None):
+
+    # Price and all twelve Greeks from a single set of simulated paths
+    greeks, _ = monte_carlo_greeks(option_type, S, K, T, r, sigma, q, num_simulations, seed=seed)
 
     # Return the Greeks as separate dictionaries
-    first_order_greeks = {
-        'Delta': delta,
-        'Gamma': gamma,
-        'Theta': theta,
-        'Vega': vega,
-        'Rho': rho
-    }
-    second_order_greeks = {
-        'Charm': charm,
-        'Speed': speed,
-        'Color': color,
-        'Zomma': zomma,
-        'Veta': veta,
-        'Volga': volga
-    }
-    return first_order_greeks, second_order_greeks
\ No newline at end of file
+    return greeks.first_order(), greeks.second_order()
@@ -1,7 +1,9 @@
 import streamlit as st
 import pandas as pd
 from src.greeks.calculate_greeks import calculate_greeks_black_scholes, calculate_greeks_monte_carlo
+from src.models.jobs import BackgroundJob
 from src.utils.user_input import UserInput
+from src.visualisations.session_jobs import session_job, show_job
 
 def get_user_parameters():
     user_input = UserInput()
@@ -19,20 +21,36 @@ def analyze_greeks(parameters):
     q = parameters['dividend_yield']
     option_type = parameters['option_type']
     num_simulations = parameters['num_simulations']
+    seed = parameters.get('seed')
 
     # Calculate Greeks using Black-Scholes
     first_order_greeks_bs, second_order_greeks_bs = calculate_greeks_black_scholes(
         option_type, S, K, T, r, sigma, q)
 
-    # Calculate Greeks using Monte Carlo
-    first_order_greeks_mc, second_order_greeks_mc = calculate_greeks_monte_carlo(
-        option_type, S, K, T, r, sigma, q, num_simulations)
-    
+    # Calculate Greeks using Monte Carlo in the background; the Black-Scholes columns are shown meanwhile
+    job = session_job('greeks_monte_carlo', (option_type, S, K, T, r, sigma, q, num_simulations, seed),
+                      lambda: BackgroundJob(calculate_greeks_monte_carlo, option_type, S, K, T, r, sigma, q,
+                                            num_simulations, seed=seed))
+
+    def render(job):
+        if job.done:
+            first_order_greeks_mc, second_order_greeks_mc = job.result()
+        else:
+            first_order_greeks_mc = second_order_greeks_mc = {}
+            st.caption(f"Simulating {num_simulations:,} paths for the Monte Carlo Greeks...")
+        _show_greeks_tables(first_order_greeks_bs, second_order_greeks_bs, first_order_greeks_mc,
+                            second_order_greeks_mc)
+
+    show_job(job, render, label="Monte Carlo Greeks")
+    return parameters
+
+def _show_greeks_tables(first_order_greeks_bs, second_order_greeks_bs, first_order_greeks_mc, second_order_greeks_mc):
+
     # Create a DataFrame to compare the first-order Greeks
     comparison_first_order_df = pd.DataFrame({
         'Greek': ['Delta', 'Gamma', 'Theta', 'Vega', 'Rho'],
         'Black-Scholes': [first_order_greeks_bs['Delta'], first_order_greeks_bs['Gamma'], first_order_greeks_bs['Theta'], first_order_greeks_bs['Vega'], first_order_greeks_bs['Rho']],
-        'Monte Carlo': [first_order_greeks_mc['Delta'], first_order_greeks_mc['Gamma'], first_order_greeks_mc['Theta'], first_order_greeks_mc['Vega'], first_order_greeks_mc['Rho']]
+        'Monte Carlo': [first_order_greeks_mc.get(greek, float('nan')) for greek in ['Delta', 'Gamma', 'Theta', 'Vega', 'Rho']]
     })
 
     # Set the Greek column as the index for first-order Greeks
@@ -50,7 +68,7 @@ def analyze_greeks(parameters):
     comparison_second_order_df = pd.DataFrame({
         'Greek': ['Charm', 'Speed', 'Color', 'Zomma', 'Veta', 'Volga'],
         'Black-Scholes': [second_order_greeks_bs['Charm'], second_order_greeks_bs['Speed'], second_order_greeks_bs['Color'], second_order_greeks_bs['Zomma'], second_order_greeks_bs['Veta'], second_order_greeks_bs['Volga']],
-        'Monte Carlo': [second_order_greeks_mc['Charm'], second_order_greeks_mc['Speed'], second_order_greeks_mc['Color'], second_order_greeks_mc['Zomma'], second_order_greeks_mc['Veta'], second_order_greeks_mc['Volga']]
+        'Monte Carlo': [second_order_greeks_mc.get(greek, float('nan')) for greek in ['Charm', 'Speed', 'Color', 'Zomma', 'Veta', 'Volga']]
     })
 
     # Set the Greek column as the index for second-order Greeks
@@ -62,6 +80,4 @@ def analyze_greeks(parameters):
     # Display the second-order Greeks DataFrame
     st.subheader("Second-Order Greeks Comparison")
     st.dataframe(comparison_second_order_df)
-    st.markdown("---")
-
-    return parameters
\ No newline at end of file
+    st.markdown("---")
\ No newline at end of file
@@ -1,4 +1,17 @@
-from .black_scholes import calculate_black_scholes
-from .monte_carlo import calculate_monte_carlo
+from .black_scholes import black_scholes, black_scholes_vectorized
+from .monte_carlo import monte_carlo_simulation
+from .lattice import lattice_option
+from .path_dependent import asian_option, barrier_option, lookback_option
+from .backend import get_backend, set_backend
 
-__all__ = ['calculate_black_scholes', 'calculate_monte_carlo']
\ No newline at end of file
+__all__ = ['black_scholes', 'black_scholes_vectorized', 'monte_carlo_simulation', 'lattice_option', 'asian_option',
+           'barrier_option', 'lookback_option', 'get_backend', 'set_backend', 'calculate_black_scholes',
+           'calculate_monte_carlo']
+
+# The Streamlit-driven calculate_* helpers live with the UI code and are only imported when asked for,
+# so importing the pricing models never pulls in Streamlit
+def __getattr__(name):
+    if name in ('calculate_black_scholes', 'calculate_monte_carlo'):
+        from src.utils import model_adapters
+        return getattr(model_adapters, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
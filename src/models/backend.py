@@ -0,0 +1,116 @@
+import math
+import os
+import warnings
+
+import numpy as np
+from src.models.distributions import norm_cdf
+
+# Array kernels behind black_scholes_vectorized and the plain Monte Carlo estimator. "numpy" is always
+# available; "numba" compiles fused, multi-threaded loops and is used only if Numba is installed.
+# Select with set_backend() or the OPTIONS_BACKEND environment variable
+BACKENDS = ("numpy", "numba")
+ENV_BACKEND = 'OPTIONS_BACKEND'
+
+_SQRT_HALF = math.sqrt(0.5)
+
+def scalar_norm_cdf(x):
+
+    # Standard normal CDF for a single float through math.erfc, which avoids NumPy's per-call
+    # dispatch on the scalar pricing path
+    return 0.5 * math.erfc(-x * _SQRT_HALF)
+
+class NumpyBackend:
+    name = "numpy"
+
+    def black_scholes(self, is_call, S, K, T, r, sigma, q):
+        sqrt_T = np.sqrt(T)
+        d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / (sigma * sqrt_T)
+        d2 = d1 - sigma * sqrt_T
+
+        # A single signed formula covers calls (+1) and puts (-1)
+        sign = np.where(is_call, 1.0, -1.0)
+        return sign * (S * np.exp(-q * T) * norm_cdf(sign * d1) - K * np.exp(-r * T) * norm_cdf(sign * d2))
+
+    def mean_discounted_payoff(self, is_call, S, K, T, r, sigma, q, normals, scale):
+
+        # normals are standard normal shocks of the log-price scaled by scale (sqrt(T), or sqrt(dt)
+        # for summed daily shocks)
+        drift = (r - q - 0.5 * sigma ** 2) * T
+        prices = S * np.exp(drift + sigma * scale * normals)
+        payoffs = np.maximum(prices - K, 0) if is_call else np.maximum(K - prices, 0)
+        return np.mean(np.exp(-r * T) * payoffs)
+
+class NumbaBackend:
+    name = "numba"
+
+    def __init__(self):
+        import numba
+
+        @numba.njit(parallel=True, cache=True, error_model='numpy')
+        def black_scholes_kernel(sign, S, K, T, r, sigma, q, out):
+            for i in numba.prange(out.size):
+                sqrt_T = math.sqrt(T[i])
+                d1 = (math.log(S[i] / K[i]) + (r[i] - q[i] + 0.5 * sigma[i] ** 2) * T[i]) / (sigma[i] * sqrt_T)
+                d2 = d1 - sigma[i] * sqrt_T
+                out[i] = sign[i] * (S[i] * math.exp(-q[i] * T[i]) * 0.5 * math.erfc(-sign[i] * d1 * _SQRT_HALF)
+                                    - K[i] * math.exp(-r[i] * T[i]) * 0.5 * math.erfc(-sign[i] * d2 * _SQRT_HALF))
+
+        # Terminal price, payoff and discounting fused into one pass with no per-path temporaries
+        @numba.njit(parallel=True, cache=True, error_model='numpy')
+        def payoff_sum_kernel(sign, S, K, drift, volatility, normals):
+            total = 0.0
+            for i in numba.prange(normals.size):
+                total += max(sign * (S * math.exp(drift + volatility * normals[i]) - K), 0.0)
+            return total
+
+        self._black_scholes_kernel = black_scholes_kernel
+        self._payoff_sum_kernel = payoff_sum_kernel
+
+    def black_scholes(self, is_call, S, K, T, r, sigma, q):
+
+        # The kernel walks flat contiguous arrays; broadcast views are materialised first
+        shape = np.shape(S)
+        sign = np.where(is_call, 1.0, -1.0).ravel()
+        arrays = [np.ascontiguousarray(x, dtype=np.float64).ravel() for x in (S, K, T, r, sigma, q)]
+        out = np.empty(sign.size)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self._black_scholes_kernel(sign, *arrays, out)
+        return out.reshape(shape)
+
+    def mean_discounted_payoff(self, is_call, S, K, T, r, sigma, q, normals, scale):
+        drift = (r - q - 0.5 * sigma ** 2) * T
+        normals = np.ascontiguousarray(normals, dtype=np.float64).ravel()
+        total = self._payoff_sum_kernel(1.0 if is_call else -1.0, float(S), float(K), float(drift),
+                                        float(sigma * scale), normals)
+        return math.exp(-r * T) * total / normals.size
+
+_backend = None
+
+def available_backends():
+    try:
+        import numba  # noqa: F401
+    except ImportError:
+        return ("numpy",)
+    return BACKENDS
+
+def set_backend(name):
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Invalid backend. Use one of {BACKENDS}.")
+    if name == "numba":
+        try:
+            _backend = NumbaBackend()
+        except ImportError:
+            warnings.warn("Numba is not installed; falling back to the NumPy backend.", RuntimeWarning,
+                          stacklevel=2)
+            _backend = NumpyBackend()
+    else:
+        _backend = NumpyBackend()
+    return _backend
+
+def get_backend():
+
+    # Resolved on first use so that importing the models never imports (or compiles with) Numba
+    if _backend is None:
+        return set_backend(os.environ.get(ENV_BACKEND, "numpy").strip().lower() or "numpy")
+    return _backend
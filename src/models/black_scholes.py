@@ -1,6 +1,8 @@
+import math
+
 import numpy as np
-from scipy.stats import norm
-from src.utils.user_input import UserInput
+from src.models.backend import get_backend, scalar_norm_cdf
+from src.utils import instrumentation
 
 def black_scholes(option_type, S, K, T, r, sigma, q=0):
     
@@ -9,36 +11,58 @@ def black_scholes(option_type, S, K, T, r, sigma, q=0):
         raise ValueError("S, K, and T must be greater than zero.")
     if sigma < 0:
         raise ValueError("Volatility (sigma) must be non-negative.")
+    instrumentation.count('black_scholes_calls')
 
-    # Calculate d1 and d2
-    d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
-
-    if option_type == "Call":
-        price = (S * np.exp(-q * T) * norm.cdf(d1)) - (K * np.exp(-r * T) * norm.cdf(d2))
-    elif option_type == "Put":
-        price = (K * np.exp(-r * T) * norm.cdf(-d2)) - (S * np.exp(-q * T) * norm.cdf(-d1))
-    else:
+    if option_type not in ("Call", "Put"):
         raise ValueError("Invalid option type. Use 'Call' or 'Put'.")
+    sign = 1.0 if option_type == "Call" else -1.0
+
+    # Plain floats through the math module: for a single contract NumPy's per-call overhead dominates
+    S, K, T, r, sigma, q = float(S), float(K), float(T), float(r), float(sigma), float(q)
+    discounted_spot = S * math.exp(-q * T)
+    discounted_strike = K * math.exp(-r * T)
+    if sigma == 0:
+        # Zero volatility: the option is worth its intrinsic value on the forward, discounted to today
+        return max(sign * (discounted_spot - discounted_strike), 0.0)
+
+    # Calculate d1 and d2
+    d1 = (math.log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / (sigma * math.sqrt(T))
+    d2 = d1 - sigma * math.sqrt(T)
+
+    price = sign * (discounted_spot * scalar_norm_cdf(sign * d1) - discounted_strike * scalar_norm_cdf(sign * d2))
 
     return price
 
-def calculate_black_scholes():
-    
-    # Create an instance of UserInput to gather parameters
-    user_input = UserInput()
-    user_input.gather_input(prefix="black_scholes_")
-    parameters = user_input.get_parameters()
-
-    # Extract parameters
-    underlying_price = parameters['underlying_price']
-    strike_price = parameters['strike_price']
-    time_to_expiration = parameters['time_to_expiration']  # Already in years
-    risk_free_rate = parameters['risk_free_rate']  # As a decimal
-    volatility = parameters['volatility']  # As a decimal
-    dividend_yield = parameters['dividend_yield']  # As a decimal
-    option_type = parameters['option_type']
-
-    # Calculate option price using the Black-Scholes formula
-    option_price = black_scholes(option_type, underlying_price, strike_price, time_to_expiration, risk_free_rate, volatility, dividend_yield)
-    return option_price
\ No newline at end of file
+def option_type_mask(option_type):
+
+    # Accept "Call"/"Put" labels (scalar or array) or a boolean/int array where 1 means Call
+    option_type = np.asarray(option_type)
+    if option_type.dtype.kind in "USO":
+        labels = np.char.capitalize(option_type.astype(str))
+        is_call = labels == "Call"
+        if not np.all(is_call | (labels == "Put")):
+            raise ValueError("Invalid option type. Use 'Call' or 'Put'.")
+        return is_call
+    if option_type.dtype.kind not in "biu":
+        raise ValueError("Option type arrays must be boolean or integer (1 = Call, 0 = Put).")
+    if not np.all((option_type == 0) | (option_type == 1)):
+        raise ValueError("Option type arrays must only contain 0 (Put) or 1 (Call).")
+    return option_type.astype(bool)
+
+def black_scholes_vectorized(option_type, S, K, T, r, sigma, q=0):
+
+    # Broadcast every input against the others so any combination of scalars and arrays works
+    is_call, S, K, T, r, sigma, q = np.broadcast_arrays(
+        option_type_mask(option_type),
+        *(np.asarray(x, dtype=float) for x in (S, K, T, r, sigma, q))
+    )
+
+    # Input validation with masks instead of per-contract branching
+    if np.any((S <= 0) | (K <= 0) | (T <= 0)):
+        raise ValueError("S, K, and T must be greater than zero.")
+    if np.any(sigma < 0):
+        raise ValueError("Volatility (sigma) must be non-negative.")
+    instrumentation.count('black_scholes_calls')
+
+    # Price the whole batch with the active backend kernel (NumPy by default, Numba if selected)
+    return get_backend().black_scholes(is_call, S, K, T, r, sigma, q)
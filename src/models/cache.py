@@ -0,0 +1,185 @@
+import copy
+import functools
+import inspect
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Every memoized function registers its cache here so statistics can be reported in one place
+_registry = {}
+
+def _nbytes(value):
+
+    # Approximate memory footprint of a cached result (ndarrays dominate, containers are walked)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_nbytes(k) + _nbytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_nbytes(v) for v in value)
+    if hasattr(type(value), '__slots__'):
+        return sys.getsizeof(value) + sum(_nbytes(getattr(value, name, None)) for name in type(value).__slots__)
+    return sys.getsizeof(value)
+
+def _make_read_only(value):
+
+    # Cached results are shared between callers, so their arrays are locked against in-place writes
+    # when stored (walking the same containers as _nbytes)
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, dict):
+        for v in value.values():
+            _make_read_only(v)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            _make_read_only(v)
+    elif hasattr(type(value), '__slots__'):
+        for name in type(value).__slots__:
+            _make_read_only(getattr(value, name, None))
+
+def _copy_result(value):
+
+    # Fresh containers and result objects for every caller, sharing the read-only arrays, so that
+    # reassigning a field or a dict entry never changes what later callers get back
+    if isinstance(value, dict):
+        return {k: _copy_result(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_result(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_copy_result(v) for v in value)
+    if hasattr(type(value), '__slots__'):
+        result = copy.copy(value)
+        for name in type(value).__slots__:
+            if hasattr(value, name):
+                setattr(result, name, _copy_result(getattr(value, name)))
+        return result
+    return value
+
+class LRUCache:
+
+    def __init__(self, maxsize=128, max_bytes=None):
+        if maxsize is not None and maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer or None.")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer or None.")
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.uncacheable = 0
+
+    def get(self, key):
+
+        # Returns (found, value) and marks the entry as most recently used
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key][0]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        size = _nbytes(value)
+
+        # Results larger than the whole byte budget are never stored
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.nbytes += size
+
+            # Evict least recently used entries until both the count and byte limits hold
+            while ((self.maxsize is not None and len(self._entries) > self.maxsize)
+                   or (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.nbytes -= evicted_size
+                self.evictions += 1
+
+    def record_uncacheable(self):
+        with self._lock:
+            self.uncacheable += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = self.misses = self.evictions = self.uncacheable = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'uncacheable': self.uncacheable,
+                'currsize': len(self._entries),
+                'maxsize': self.maxsize,
+                'nbytes': self.nbytes,
+                'max_bytes': self.max_bytes,
+            }
+
+def _freeze(value):
+
+    # Turn an argument into a hashable key component; None signals that the call cannot be cached
+    if isinstance(value, (np.generic, float, int, str, bool, type(None))):
+        return value.item() if isinstance(value, np.generic) else value
+    if isinstance(value, tuple):
+        frozen = tuple(_freeze(v) for v in value)
+        return None if any(f is None and v is not None for f, v in zip(frozen, value)) else frozen
+    return None
+
+def memoize(maxsize=128, max_bytes=None):
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        cache = LRUCache(maxsize, max_bytes)
+        _registry[f'{func.__module__}.{func.__qualname__}'] = cache
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+
+            # A seed of None asks for fresh randomness, so such calls (and calls with array
+            # arguments such as pre-drawn random numbers) always bypass the cache
+            arguments = bound.arguments
+            key = tuple((name, _freeze(value)) for name, value in arguments.items())
+            cacheable = all(frozen is not None or arguments[name] is None for name, frozen in key)
+            if 'seed' in arguments and arguments['seed'] is None:
+                cacheable = False
+            if not cacheable:
+                cache.record_uncacheable()
+                return func(*args, **kwargs)
+
+            found, value = cache.get(key)
+            if not found:
+                value = func(*args, **kwargs)
+                _make_read_only(value)
+                cache.put(key, value)
+            return _copy_result(value)
+
+        wrapper.cache = cache
+        wrapper.cache_info = cache.stats
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+def cache_stats():
+    return {name: cache.stats() for name, cache in _registry.items()}
+
+def clear_caches():
+    for cache in _registry.values():
+        cache.clear()
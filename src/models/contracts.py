@@ -0,0 +1,15 @@
+# Column layout of a contract book, shared by the portfolio pricer, the scenario and tick engines and the
+# pricing service. Kept free of pandas so that importing it stays cheap
+CONTRACT_COLUMNS = ['type', 'S', 'K', 'T', 'r', 'sigma', 'q']
+
+# Upper bound on contracts x paths simulated at once by the Monte Carlo model
+MC_BLOCK_SIZE = 2_000_000
+
+def contract_arrays(contracts):
+
+    # Validate a book (a DataFrame) once and hand back plain NumPy columns
+    missing = [column for column in CONTRACT_COLUMNS if column not in contracts.columns]
+    if missing:
+        raise ValueError(f"Contracts are missing required columns: {missing}")
+    return {column: contracts[column].to_numpy() if column == 'type' else contracts[column].to_numpy(dtype=float)
+            for column in CONTRACT_COLUMNS}
@@ -0,0 +1,15 @@
+import numpy as np
+
+# SciPy is only needed once something is actually priced, so it is imported on first use rather than
+# at module import time; this keeps the numerical core importable with NumPy alone
+
+def norm_cdf(x):
+    from scipy.special import ndtr
+    return ndtr(x)
+
+def norm_pdf(x):
+    return np.exp(-0.5 * np.square(x)) / np.sqrt(2 * np.pi)
+
+def norm_ppf(p):
+    from scipy.special import ndtri
+    return ndtri(p)
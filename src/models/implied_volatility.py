@@ -0,0 +1,136 @@
+import numpy as np
+from src.greeks.calculate_greeks import black_scholes_greeks
+from src.models.black_scholes import option_type_mask
+
+# Search interval for the volatility (as a decimal)
+MIN_VOLATILITY = 1e-6
+MAX_VOLATILITY = 10.0
+
+class ImpliedVolatilityResult:
+    __slots__ = ('volatility', 'iterations', 'converged', 'valid')
+
+    def __init__(self, volatility, iterations, converged, valid):
+        self.volatility = volatility
+        self.iterations = iterations
+        self.converged = converged
+        self.valid = valid
+
+    def __repr__(self):
+        return (f"ImpliedVolatilityResult(volatility={self.volatility!r}, iterations={self.iterations!r}, "
+                f"converged={self.converged!r}, valid={self.valid!r})")
+
+def _initial_guess(call_price, discounted_spot, discounted_strike, T):
+
+    # Corrado-Miller rational approximation on the call-equivalent price, with Brenner-Subrahmanyam
+    # as a fallback where its square root goes negative
+    moneyness = discounted_spot - discounted_strike
+    excess = call_price - moneyness / 2
+    radicand = excess ** 2 - moneyness ** 2 / np.pi
+    corrado_miller = (np.sqrt(2 * np.pi) / (discounted_spot + discounted_strike)
+                      * (excess + np.sqrt(np.maximum(radicand, 0))) / np.sqrt(T))
+    brenner_subrahmanyam = np.sqrt(2 * np.pi / T) * call_price / discounted_spot
+    guess = np.where((radicand >= 0) & (corrado_miller > 0), corrado_miller, brenner_subrahmanyam)
+    return np.clip(guess, 1e-3, 5.0)
+
+def _small_price_guess(otm_price, discounted_spot, discounted_strike, T):
+
+    # Lower asymptote of the normalised out-of-the-money price, beta ~ exp(-x^2 / (2 s^2)), which is
+    # where the rational guess breaks down (far wings, prices many orders of magnitude below the spot)
+    log_moneyness = np.abs(np.log(discounted_spot / discounted_strike))
+    normalised_price = otm_price / np.sqrt(discounted_spot * discounted_strike)
+    guess = log_moneyness / np.sqrt(2 * np.abs(np.log(np.minimum(normalised_price, 0.5)))) / np.sqrt(T)
+    return np.clip(guess, 1e-3, 5.0)
+
+def _log_price_error(is_call, S, K, T, r, sigma, q, target):
+
+    # Price and its first two volatility derivatives from the closed-form Greeks
+    greeks = black_scholes_greeks(is_call, S, K, T, r, sigma, q)
+    model = np.maximum(greeks.price, 1e-300)
+    return np.log(model) - np.log(target), model, greeks.vega, greeks.volga
+
+def implied_volatility(option_type, price, S, K, T, r, q=0, tol=1e-10, max_iterations=20):
+
+    # Broadcast the whole chain so every strike and maturity is solved in the same array passes
+    is_call, price, S, K, T, r, q = np.broadcast_arrays(
+        option_type_mask(option_type),
+        *(np.asarray(x, dtype=float) for x in (price, S, K, T, r, q))
+    )
+    shape = price.shape
+    is_call, price, S, K, T, r, q = (np.atleast_1d(x).ravel() for x in (is_call, price, S, K, T, r, q))
+    sign = np.where(is_call, 1.0, -1.0)
+
+    # No-arbitrage bounds: strictly above intrinsic value and below the discounted asset (call) or strike (put)
+    with np.errstate(invalid='ignore', over='ignore'):
+        discounted_spot = S * np.exp(-q * T)
+        discounted_strike = K * np.exp(-r * T)
+    lower = np.maximum(sign * (discounted_spot - discounted_strike), 0)
+    upper = np.where(is_call, discounted_spot, discounted_strike)
+    valid = (S > 0) & (K > 0) & (T > 0) & (price > lower) & (price < upper)
+
+    # Solve on the out-of-the-money side (put-call parity), where the price is all time value
+    otm_call = discounted_strike >= discounted_spot
+    otm_sign = np.where(otm_call, 1.0, -1.0)
+    otm_price = price - np.where(sign == otm_sign, 0.0, sign * (discounted_spot - discounted_strike))
+    valid &= otm_price > 0
+
+    # Start from whichever of the rational and small-price guesses reprices closer to the quote
+    call_price = np.where(otm_call, otm_price, otm_price + discounted_spot - discounted_strike)
+    index = np.flatnonzero(valid)
+    arguments = (otm_call[index], S[index], K[index], T[index], r[index])
+    rational = _initial_guess(call_price[index], discounted_spot[index], discounted_strike[index], T[index])
+    asymptotic = _small_price_guess(otm_price[index], discounted_spot[index], discounted_strike[index], T[index])
+    rational_error = _log_price_error(*arguments, rational, q[index], otm_price[index])[0]
+    asymptotic_error = _log_price_error(*arguments, asymptotic, q[index], otm_price[index])[0]
+    sigma = np.full(price.shape, np.nan)
+    sigma[index] = np.where(np.abs(asymptotic_error) < np.abs(rational_error), asymptotic, rational)
+
+    iterations = np.zeros(price.shape, dtype=np.int64)
+    active = valid.copy()
+
+    # The price rises with volatility, so every evaluation also narrows a bracket around the root
+    lower_volatility = np.full(price.shape, MIN_VOLATILITY)
+    upper_volatility = np.full(price.shape, MAX_VOLATILITY)
+
+    # Halley steps on the log-price with analytic vega and volga; the log keeps deep out-of-the-money
+    # quotes well conditioned. A step that leaves the bracket (Newton overshooting on a flat, near-zero
+    # vega stretch) is replaced by bisection, so every quote converges. Only unconverged contracts are
+    # re-evaluated on each pass
+    for _ in range(max_iterations):
+        index = np.flatnonzero(active)
+        if index.size == 0:
+            break
+        current = sigma[index]
+        error, model, vega, volga = _log_price_error(otm_call[index], S[index], K[index], T[index], r[index],
+                                                     current, q[index], otm_price[index])
+        lower_volatility[index] = np.where(error < 0, np.maximum(lower_volatility[index], current),
+                                           lower_volatility[index])
+        upper_volatility[index] = np.where(error > 0, np.minimum(upper_volatility[index], current),
+                                           upper_volatility[index])
+
+        slope = np.maximum(vega, 1e-300) / model
+        curvature = volga / model - slope ** 2
+        newton = error / slope
+        with np.errstate(invalid='ignore', over='ignore'):
+            step = newton / np.maximum(1 - 0.5 * newton * curvature / slope, 0.5)
+            updated = current - step
+        low, high = lower_volatility[index], upper_volatility[index]
+        updated = np.where((updated > low) & (updated < high), updated, 0.5 * (low + high))
+
+        # A quote already repriced within tol keeps the volatility that did it: the evaluation may have
+        # shrunk the bracket onto that point, which would otherwise swap the tiny final step for bisection
+        repriced = np.abs(error) <= tol
+        updated = np.where(repriced, current, updated)
+        step = current - updated
+
+        sigma[index] = updated
+        iterations[index] += 1
+        active[index] = (np.abs(step) > tol * np.maximum(1.0, updated)) & ~repriced
+
+    converged = valid & ~active
+    volatility = np.where(valid, sigma, np.nan)
+
+    # Hand back plain values for scalar inputs
+    if len(shape) == 0:
+        return ImpliedVolatilityResult(float(volatility[0]), int(iterations[0]), bool(converged[0]), bool(valid[0]))
+    return ImpliedVolatilityResult(volatility.reshape(shape), iterations.reshape(shape),
+                                   converged.reshape(shape), valid.reshape(shape))
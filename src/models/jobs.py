@@ -0,0 +1,145 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.models.monte_carlo import monte_carlo_streaming
+from src.utils import instrumentation
+
+# Monte Carlo runs (and other slow calls) started off the caller's thread. NumPy releases the GIL while
+# drawing and transforming each chunk, so a Streamlit script (or any other caller) stays responsive and
+# can poll the estimate as it refines
+JOB_STATES = ("pending", "running", "finished", "cancelled", "failed")
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max(2, os.cpu_count() or 1),
+                                           thread_name_prefix='monte-carlo-job')
+        return _executor
+
+class BackgroundJob:
+
+    # Runs func(*args, **kwargs) on the shared executor; subclasses that refine a result as they go
+    # append snapshots to the progress list
+    def __init__(self, func, *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self._lock = threading.Lock()
+        self._cancel_event = threading.Event()
+        self._progress = []
+        self._future = None
+        self.state = "pending"
+        self.error = None
+
+    def start(self):
+        if self._future is not None:
+            raise RuntimeError("Job has already been started.")
+        self.state = "running"
+
+        # Counters recorded by the job go to the recorder of whoever started it (its Streamlit session)
+        self._recorder = instrumentation.current_recorder()
+        self._future = _get_executor().submit(self._run)
+        return self
+
+    def _record(self, snapshot):
+        with self._lock:
+            self._progress.append(snapshot)
+
+    def _execute(self):
+        return self.func(*self.args, **self.kwargs)
+
+    def _cancelled(self, result):
+        return self._cancel_event.is_set()
+
+    def _run(self):
+        try:
+            with instrumentation.recording(self._recorder):
+                result = self._execute()
+        except Exception as error:
+            self.error = error
+            self.state = "failed"
+            raise
+        self.state = "cancelled" if self._cancelled(result) else "finished"
+        return result
+
+    def cancel(self):
+        # Takes effect at the next checkpoint of the job; a job that has not started yet never runs
+        self._cancel_event.set()
+        if self._future is not None and self._future.cancel():
+            self.state = "cancelled"
+
+    @property
+    def running(self):
+        return self.state in ("pending", "running") and self._future is not None
+
+    @property
+    def done(self):
+        return self._future is not None and self._future.done()
+
+    def progress(self):
+        with self._lock:
+            return list(self._progress)
+
+    def latest(self):
+        with self._lock:
+            return self._progress[-1] if self._progress else None
+
+    def result(self, timeout=None):
+        if self._future is None:
+            raise RuntimeError("Job has not been started.")
+        return self._future.result(timeout)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(state={self.state!r}, steps={len(self.progress())!r})"
+
+class MonteCarloJob(BackgroundJob):
+
+    def __init__(self, option_type, S, K, T, r, sigma, q=0, max_paths=10_000_000, chunk_size=50_000,
+                 target_std_error=None, max_time=None, sampling="exact", num_steps=365, seed=None,
+                 keep_payoffs=False, sketch_bins=None):
+        super().__init__(monte_carlo_streaming)
+        self.arguments = dict(option_type=option_type, S=S, K=K, T=T, r=r, sigma=sigma, q=q,
+                              max_paths=max_paths, chunk_size=chunk_size, target_std_error=target_std_error,
+                              max_time=max_time, sampling=sampling, num_steps=num_steps, seed=seed,
+                              keep_payoffs=keep_payoffs, sketch_bins=sketch_bins)
+
+    def _on_chunk(self, stats, elapsed):
+
+        # Progress holds (num_paths, price, std_error, elapsed) after every completed chunk
+        self._record((stats.count, stats.mean, stats.std_error, elapsed))
+
+    def _execute(self):
+        return self.func(**self.arguments, on_chunk=self._on_chunk, cancel_event=self._cancel_event)
+
+    def _cancelled(self, result):
+        return result.stop_reason == 'cancelled'
+
+    def __repr__(self):
+        latest = self.latest()
+        paths = latest[0] if latest else 0
+        return f"MonteCarloJob(state={self.state!r}, num_paths={paths!r})"
+
+class SweepJob(BackgroundJob):
+
+    # Evaluates func at each value in turn (a sensitivity sweep, say), recording (value, result) pairs
+    # as they complete; cancelling stops the sweep before the next value
+    def __init__(self, func, values):
+        super().__init__(func)
+        self.values = list(values)
+
+    def _execute(self):
+        results = []
+        for value in self.values:
+            if self._cancel_event.is_set():
+                break
+            results.append(self.func(value))
+            self._record((value, results[-1]))
+        return results
+
+    def _cancelled(self, result):
+        return len(result) < len(self.values)
@@ -1,9 +1,80 @@
+import os
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from statistics import NormalDist
+
 import numpy as np
-from src.utils.user_input import UserInput
+from src.models.backend import get_backend
+from src.models.black_scholes import black_scholes_vectorized
+from src.models.cache import memoize
+from src.models.distributions import norm_ppf
+from src.models.random_pool import MIN_POOL_SIZE, pooled_normals, standard_normals
+from src.utils import instrumentation
 
-def monte_carlo_simulation(option_type, S, K, T, r, sigma, q=0, num_simulations=10000, random_numbers=None):
+SAMPLING_MODES = ("exact", "stepped")
 
-    # Input validation
+# Upper bound on the number of normals drawn at once by the stepped mode
+STEP_BLOCK_SIZE = 1_000_000
+
+def _stepped_normal_sums(rng, num_simulations, num_steps):
+
+    # Accumulate the per-step shocks in blocks of time steps so memory stays O(num_simulations)
+    block_steps = max(1, min(num_steps, STEP_BLOCK_SIZE // num_simulations))
+    normal_sums = np.zeros(num_simulations)
+    for start in range(0, num_steps, block_steps):
+        steps = min(block_steps, num_steps - start)
+        normal_sums += rng.standard_normal((steps, num_simulations)).sum(axis=0)
+    return normal_sums
+
+def terminal_shocks(T, num_simulations=10000, random_numbers=None, sampling="exact", num_steps=365, seed=None):
+
+    # Standard normal shocks of the terminal log-price and the factor that scales them by sigma:
+    # one draw per path with sqrt(T) (exact), or the sum of the daily draws with sqrt(dt) (stepped)
+    if sampling not in SAMPLING_MODES:
+        raise ValueError(f"Invalid sampling mode. Use one of {SAMPLING_MODES}.")
+
+    if sampling == "exact":
+        # GBM has a closed-form terminal distribution, so one normal per path is enough; seeded runs read
+        # them from the shared random-number pool
+        if random_numbers is None:
+            random_numbers = standard_normals(seed, num_simulations)
+        if random_numbers.shape != (num_simulations,):
+            raise ValueError(f"random_numbers must have shape ({num_simulations},) for exact sampling")
+        return random_numbers, np.sqrt(T)
+
+    # Stepped mode: sum the daily log-increments of every path at once
+    dt = T / num_steps
+    if random_numbers is None:
+        normal_sums = _stepped_normal_sums(np.random.default_rng(seed), num_simulations, num_steps)
+    elif random_numbers.shape != (num_simulations, num_steps):
+        raise ValueError(f"random_numbers must have shape ({num_simulations}, {num_steps}) for stepped sampling")
+    else:
+        normal_sums = random_numbers.sum(axis=1)
+    return normal_sums, np.sqrt(dt)
+
+def simulate_terminal_prices(S, T, r, sigma, q=0, num_simulations=10000, random_numbers=None,
+                             sampling="exact", num_steps=365, seed=None):
+    normals, scale = terminal_shocks(T, num_simulations, random_numbers, sampling, num_steps, seed)
+    drift = (r - q - 0.5 * sigma ** 2) * T
+    return S * np.exp(drift + sigma * scale * normals)
+
+def option_payoffs(option_type, prices, K):
+
+    # Calculate option payoffs
+    if option_type == "Call":
+        return np.maximum(prices - K, 0)
+    return np.maximum(K - prices, 0)
+
+def discounted_payoffs(option_type, S, K, T, r, sigma, q=0, num_simulations=10000, random_numbers=None,
+                       sampling="exact", num_steps=365, seed=None):
+
+    # Per-path present values; their mean is the Monte Carlo price
+    prices = simulate_terminal_prices(S, T, r, sigma, q, num_simulations, random_numbers,
+                                      sampling, num_steps, seed)
+    return np.exp(-r * T) * option_payoffs(option_type, prices, K)
+
+def _validate_inputs(option_type, S, K, T, sigma, num_simulations):
     if S <= 0:
         raise ValueError("Underlying asset price (S) must be greater than zero.")
     if K <= 0:
@@ -17,55 +88,458 @@ def monte_carlo_simulation(option_type, S, K, T, r, sigma, q=0, num_simulations=
     if option_type not in ["Call", "Put"]:
         raise ValueError("Invalid option type. Use 'Call' or 'Put'.")
 
-    # Simulate price paths
-    dt = T / 365  # Daily time steps
-    prices = np.zeros(num_simulations)
+@memoize(maxsize=256)
+def monte_carlo_simulation(option_type, S, K, T, r, sigma, q=0, num_simulations=10000, random_numbers=None,
+                           sampling="exact", num_steps=365, seed=None, antithetic=False, control_variate=None,
+                           sobol=False, num_workers=None):
 
-    # Generate or use provided random numbers
-    if random_numbers is None:
-        random_numbers = np.random.normal(size=(num_simulations, 365))
-    
-    # Ensure random_numbers has correct shape
-    if random_numbers.shape != (num_simulations, 365):
-        raise ValueError(f"random_numbers must have shape ({num_simulations}, 365)")
-
-    for i in range(num_simulations):
-        # Simulate the price path using geometric Brownian motion
-        # Using provided random numbers for consistency
-        price_path = S * np.exp(np.cumsum(
-            (r - q - 0.5 * sigma ** 2) * dt + 
-            sigma * np.sqrt(dt) * random_numbers[i]
-        ))
-        prices[i] = price_path[-1]  # Final price at expiration
+    # Input validation
+    _validate_inputs(option_type, S, K, T, sigma, num_simulations)
+    instrumentation.count('monte_carlo_simulation_calls')
+    instrumentation.count('simulated_paths', num_simulations)
 
-    # Calculate option payoffs
-    if option_type == "Call":
-        payoffs = np.maximum(prices - K, 0)
-    else:  # Put
-        payoffs = np.maximum(K - prices, 0)
+    # Shard the paths across a thread pool when more than one worker is requested
+    if num_workers is not None and num_workers > 1:
+        if random_numbers is not None or antithetic or control_variate is not None or sobol:
+            raise ValueError("Parallel execution supports plain pseudo-random sampling only.")
+        return monte_carlo_parallel(option_type, S, K, T, r, sigma, q, num_simulations, num_workers,
+                                    sampling=sampling, num_steps=num_steps, seed=seed).price
+
+    # Variance-reduced estimators draw their own (antithetic, quasi-random) numbers
+    if antithetic or control_variate is not None or sobol:
+        if random_numbers is not None:
+            raise ValueError("random_numbers cannot be combined with variance reduction.")
+        return monte_carlo_price(option_type, S, K, T, r, sigma, q, num_simulations, antithetic=antithetic,
+                                 control_variate=control_variate, sobol=sobol, sampling=sampling,
+                                 num_steps=num_steps, seed=seed).price
 
-    # Discount payoffs back to present value
-    option_price = np.exp(-r * T) * np.mean(payoffs)
+    # Draw the shocks with NumPy's generator (so every backend sees the same paths), then let the
+    # active backend turn them into the average discounted payoff
+    normals, scale = terminal_shocks(T, num_simulations, random_numbers, sampling, num_steps, seed)
+    option_price = get_backend().mean_discounted_payoff(option_type == "Call", S, K, T, r, sigma, q, normals, scale)
     
     return option_price
 
-def calculate_monte_carlo():
-    
-    # Create an instance of UserInput to gather parameters
-    user_input = UserInput()
-    user_input.gather_input(prefix="monte_carlo_")
-    parameters = user_input.get_parameters()
-
-    # Extract parameters
-    underlying_price = parameters['underlying_price']
-    strike_price = parameters['strike_price']
-    time_to_expiration = parameters['time_to_expiration']  # Already in years
-    risk_free_rate = parameters['risk_free_rate']  # As a decimal
-    volatility = parameters['volatility']  # As a decimal
-    dividend_yield = parameters['dividend_yield']  # As a decimal
-    option_type = parameters['option_type']
-    num_simulations = parameters['num_simulations']  # Accessing num_simulations from user input
-
-    # Perform Monte Carlo simulation
-    option_price = monte_carlo_simulation(option_type, underlying_price, strike_price, time_to_expiration, risk_free_rate, volatility, dividend_yield, num_simulations)
-    return option_price 
\ No newline at end of file
+class RunningStats:
+    # Streaming mean/variance (Welford, merged chunk by chunk with Chan's update)
+    __slots__ = ('count', 'mean', 'm2')
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    @classmethod
+    def from_values(cls, values):
+        values = np.asarray(values, dtype=float)
+        if values.size == 0:
+            return cls()
+        mean = float(values.mean())
+        return cls(values.size, mean, float(np.square(values - mean).sum()))
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.count = total
+        return self
+
+    def update(self, values):
+        return self.merge(RunningStats.from_values(values))
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else float('nan')
+
+    @property
+    def std_error(self):
+        return float(np.sqrt(self.variance / self.count)) if self.count > 1 else float('inf')
+
+class StreamingHistogram:
+    # Fixed-range fine histogram plus exact moments and extremes, updated chunk by chunk
+    __slots__ = ('edges', 'counts', 'underflow', 'overflow', 'stats', 'minimum', 'maximum')
+
+    def __init__(self, lower, upper, bins=4096):
+        if not upper > lower:
+            raise ValueError("The histogram range must have upper > lower.")
+        self.edges = np.linspace(lower, upper, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+        self.stats = RunningStats()
+        self.minimum = np.inf
+        self.maximum = -np.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        if values.size == 0:
+            return self
+        lower, upper = self.edges[0], self.edges[-1]
+        bins = len(self.counts)
+        index = np.floor((values - lower) / (upper - lower) * bins).astype(np.int64)
+        index[values == upper] = bins - 1
+        inside = (index >= 0) & (index < bins)
+        self.counts += np.bincount(index[inside], minlength=bins)
+        self.underflow += int(np.count_nonzero(index < 0))
+        self.overflow += int(np.count_nonzero(index >= bins))
+        self.stats.update(values)
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+        return self
+
+    @property
+    def count(self):
+        return self.stats.count
+
+    @property
+    def mean(self):
+        return self.stats.mean
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.stats.m2 / self.stats.count)) if self.stats.count else float('nan')
+
+    def quantile(self, probabilities):
+
+        # Interpolate inside the fine bins; out-of-range mass is pinned to the observed extremes
+        cumulative = np.concatenate([[self.underflow], self.underflow + np.cumsum(self.counts)])
+        targets = np.asarray(probabilities, dtype=float) * self.count
+        values = np.interp(targets, cumulative, self.edges)
+        values = np.where(targets <= self.underflow, self.minimum, values)
+        values = np.where(targets > cumulative[-1], self.maximum, values)
+        return np.clip(values, self.minimum, self.maximum)
+
+    def bin_centres(self):
+        return 0.5 * (self.edges[:-1] + self.edges[1:])
+
+    def weighted_values(self):
+
+        # Bin centres and counts, plus the out-of-range mass placed at the observed extremes, so a coarser
+        # histogram rebuilt from them over [minimum, maximum] accounts for every value
+        values = np.concatenate([self.bin_centres(), [self.minimum, self.maximum]])
+        weights = np.concatenate([self.counts, [self.underflow, self.overflow]])
+        return values, weights
+
+def discounted_payoff_range(option_type, S, K, T, r, sigma, q=0, tail_sigmas=8.0):
+
+    # Bounds that hold all but a vanishing tail of discounted payoffs (used to size streaming sketches)
+    discount = np.exp(-r * T)
+    if option_type == "Put":
+        return 0.0, float(discount * K)
+    upper_spot = S * np.exp((r - q - 0.5 * sigma ** 2) * T + tail_sigmas * sigma * np.sqrt(T))
+    return 0.0, float(max(discount * (upper_spot - K), discount * K * 1e-6))
+
+class MonteCarloResult:
+    __slots__ = ('price', 'std_error', 'num_paths', 'elapsed', 'converged', 'stop_reason', 'variance_reduction',
+                 'payoffs', 'sketch')
+
+    def __init__(self, price, std_error, num_paths, elapsed, converged, stop_reason, variance_reduction=1.0,
+                 payoffs=None, sketch=None):
+        self.price = price
+        self.std_error = std_error
+        self.num_paths = num_paths
+        self.elapsed = elapsed
+        self.converged = converged
+        self.stop_reason = stop_reason
+        self.variance_reduction = variance_reduction
+        self.payoffs = payoffs
+        self.sketch = sketch
+
+    def confidence_interval(self, confidence=0.95):
+        half_width = NormalDist().inv_cdf(0.5 + confidence / 2) * self.std_error
+        return self.price - half_width, self.price + half_width
+
+    def __repr__(self):
+        return (f"MonteCarloResult(price={self.price!r}, std_error={self.std_error!r}, "
+                f"num_paths={self.num_paths!r}, elapsed={self.elapsed!r}, converged={self.converged!r}, "
+                f"stop_reason={self.stop_reason!r}, variance_reduction={self.variance_reduction!r})")
+
+def monte_carlo_streaming(option_type, S, K, T, r, sigma, q=0, target_std_error=None, target_ci_width=None,
+                          confidence=0.95, chunk_size=10000, max_paths=10_000_000, max_time=None,
+                          sampling="exact", num_steps=365, seed=None, keep_payoffs=False, sketch_bins=None,
+                          on_chunk=None, cancel_event=None):
+
+    # Input validation
+    _validate_inputs(option_type, S, K, T, sigma, chunk_size)
+    if max_paths < chunk_size:
+        raise ValueError("max_paths must be at least chunk_size.")
+    if target_std_error is not None and target_std_error <= 0:
+        raise ValueError("target_std_error must be greater than zero.")
+    if target_ci_width is not None and target_ci_width <= 0:
+        raise ValueError("target_ci_width must be greater than zero.")
+
+    # A confidence-interval width target is just a standard-error target in disguise
+    targets = [target_std_error] if target_std_error is not None else []
+    if target_ci_width is not None:
+        targets.append(target_ci_width / (2 * NormalDist().inv_cdf(0.5 + confidence / 2)))
+    target = min(targets) if targets else None
+    instrumentation.count('monte_carlo_simulation_calls')
+
+    rng = np.random.default_rng(seed)
+    stats = RunningStats()
+    start = time.perf_counter()
+    stop_reason = 'max_paths'
+
+    # Optionally keep the per-path payoffs, or fold them into a fixed-size histogram sketch instead
+    chunks = [] if keep_payoffs else None
+    sketch = None
+    if sketch_bins is not None:
+        sketch = StreamingHistogram(*discounted_payoff_range(option_type, S, K, T, r, sigma, q), bins=sketch_bins)
+
+    # A seeded exact run reads consecutive slices of the random-number pool, which hold the same stream
+    # the generator would produce chunk by chunk. Open-ended runs (max_paths beyond the smallest pool)
+    # draw directly rather than growing a pool they may never use
+    pooled = (sampling == "exact" and max_paths <= MIN_POOL_SIZE
+              and pooled_normals(seed, max_paths) is not None)
+
+    # Only one chunk of payoffs is alive at a time, so peak memory does not grow with the path count
+    while stats.count < max_paths:
+        if cancel_event is not None and cancel_event.is_set():
+            stop_reason = 'cancelled'
+            break
+        size = min(chunk_size, max_paths - stats.count)
+        normals = pooled_normals(seed, max_paths)[stats.count:stats.count + size] if pooled else None
+        payoffs = discounted_payoffs(option_type, S, K, T, r, sigma, q, size, random_numbers=normals,
+                                     sampling=sampling, num_steps=num_steps, seed=rng)
+        stats.update(payoffs)
+        instrumentation.count('simulated_paths', size)
+        if chunks is not None:
+            chunks.append(payoffs)
+        if sketch is not None:
+            sketch.update(payoffs)
+
+        # Progress hook for callers that display the estimate while it refines (see src.models.jobs)
+        if on_chunk is not None:
+            on_chunk(stats, time.perf_counter() - start)
+
+        if target is not None and stats.count > 1 and stats.std_error <= target:
+            stop_reason = 'target'
+            break
+        if max_time is not None and time.perf_counter() - start >= max_time:
+            stop_reason = 'max_time'
+            break
+
+    return MonteCarloResult(
+        price=stats.mean,
+        std_error=stats.std_error,
+        num_paths=stats.count,
+        elapsed=time.perf_counter() - start,
+        converged=stop_reason == 'target',
+        stop_reason=stop_reason,
+        payoffs=np.concatenate(chunks) if chunks else None,
+        sketch=sketch,
+    )
+
+@memoize(maxsize=8, max_bytes=512 * 1024 ** 2)
+def monte_carlo_distribution(option_type, S, K, T, r, sigma, q=0, num_simulations=10000, seed=None,
+                             sketch_bins=None):
+
+    # One simulation serving both the price and its payoff distribution; with the chunk covering the
+    # whole run it draws exactly the numbers monte_carlo_simulation would for the same seed
+    return monte_carlo_streaming(option_type, S, K, T, r, sigma, q, chunk_size=min(num_simulations, 1_000_000),
+                                 max_paths=num_simulations, seed=seed, keep_payoffs=sketch_bins is None,
+                                 sketch_bins=sketch_bins)
+
+CONTROL_VARIATES = ("spot", "black_scholes")
+
+def sobol_points(num_paths):
+    return 1 << int(np.ceil(np.log2(num_paths)))
+
+def _sobol_normals(num_paths, dimension, rng):
+    from scipy.stats import qmc
+
+    # Scrambled Sobol points are only balanced in blocks of 2^m, so the path count is rounded up (see
+    # sobol_points)
+    sampler = qmc.Sobol(d=dimension, scramble=True, seed=rng)
+    points = sampler.random_base2(sobol_points(num_paths).bit_length() - 1)
+    return norm_ppf(np.clip(points, 1e-12, 1 - 1e-12))
+
+def _terminal_normals(num_paths, sampling, num_steps, sobol, rng):
+
+    # Standardised terminal shocks W_T / sqrt(T), one per path. A Brownian bridge would set the terminal
+    # point from its first Sobol coordinate alone and only use the others to fill in the path between, and
+    # the payoffs priced here depend on the terminal point only; so with Sobol sampling the stepped mode
+    # reduces to a single terminal dimension and gives exactly the same numbers as the exact mode
+    if sobol:
+        return _sobol_normals(num_paths, 1, rng)[:, 0]
+    if sampling == "exact":
+        return rng.standard_normal(num_paths)
+    return _stepped_normal_sums(rng, num_paths, num_steps) / np.sqrt(num_steps)
+
+def monte_carlo_price(option_type, S, K, T, r, sigma, q=0, num_simulations=10000, antithetic=False,
+                      control_variate=None, sobol=False, sobol_replicates=8, control_strike=None,
+                      sampling="exact", num_steps=365, seed=None):
+
+    # Input validation
+    _validate_inputs(option_type, S, K, T, sigma, num_simulations)
+    if sampling not in SAMPLING_MODES:
+        raise ValueError(f"Invalid sampling mode. Use one of {SAMPLING_MODES}.")
+    controls = () if control_variate is None else (
+        (control_variate,) if isinstance(control_variate, str) else tuple(control_variate))
+    if any(control not in CONTROL_VARIATES for control in controls):
+        raise ValueError(f"Invalid control variate. Use one or more of {CONTROL_VARIATES}.")
+
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    discount = np.exp(-r * T)
+
+    # Randomised QMC needs independent scrambles to estimate its error; plain MC is one "replicate"
+    replicates = sobol_replicates if sobol else 1
+    if sobol and replicates < 2:
+        raise ValueError("sobol_replicates must be at least 2 to estimate the standard error.")
+    draws_per_replicate = -(-num_simulations // replicates)
+    if antithetic:
+        draws_per_replicate = -(-draws_per_replicate // 2)
+
+    # Each Sobol replicate is a whole power of two of points; say so when that changes the path count
+    # (result.num_paths always reports the paths actually used)
+    if sobol and sobol_points(draws_per_replicate) != draws_per_replicate:
+        used = sobol_points(draws_per_replicate) * replicates * (2 if antithetic else 1)
+        warnings.warn(f"Sobol sampling rounds each of the {replicates} replicates up to "
+                      f"{sobol_points(draws_per_replicate):,} points (a power of two): {used:,} paths are "
+                      f"simulated instead of {num_simulations:,}.", RuntimeWarning, stacklevel=2)
+    Z = np.stack([_terminal_normals(draws_per_replicate, sampling, num_steps, sobol, rng)
+                  for _ in range(replicates)])
+
+    # Antithetic variates mirror every shock; a pair of mirrored paths forms one sampling unit
+    if antithetic:
+        Z = np.stack([Z, -Z], axis=-1)
+    else:
+        Z = Z[..., None]
+    num_paths = Z.size
+
+    terminal = S * np.exp((r - q - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z)
+    payoffs = discount * option_payoffs(option_type, terminal, K)
+    plain_variance = payoffs.var(ddof=1)
+    Y = payoffs.mean(axis=-1)
+
+    # Control variates: zero-mean regressors built from quantities with known expectations
+    if controls:
+        columns = []
+        for control in controls:
+            if control == "spot":
+                columns.append(discount * terminal - S * np.exp(-q * T))
+            else:
+                # Vanilla option struck at the forward unless told otherwise, priced exactly by Black-Scholes
+                strike = S * np.exp((r - q) * T) if control_strike is None else control_strike
+                analytic = black_scholes_vectorized(option_type, S, strike, T, r, sigma, q)
+                columns.append(discount * option_payoffs(option_type, terminal, strike) - analytic)
+        X = np.stack([column.mean(axis=-1) for column in columns], axis=-1)
+
+        # Optimal coefficients from the pooled regression of the units on the controls
+        Xc = X.reshape(-1, len(controls))
+        Yc = Y.reshape(-1)
+        Xm = Xc - Xc.mean(axis=0)
+        beta = np.linalg.lstsq(Xm, Yc - Yc.mean(), rcond=None)[0]
+        Y = Y - X @ beta
+
+    # Estimator and its standard error (across replicates for QMC, across units otherwise)
+    if sobol:
+        estimates = Y.mean(axis=1)
+        price = float(estimates.mean())
+        std_error = float(estimates.std(ddof=1) / np.sqrt(replicates))
+    else:
+        price = float(Y.mean())
+        std_error = float(Y.std(ddof=1) / np.sqrt(Y.size))
+
+    # Achieved variance versus plain Monte Carlo with the same number of paths
+    achieved = std_error ** 2
+    variance_reduction = float(plain_variance / num_paths / achieved) if achieved > 0 else float('inf')
+
+    return MonteCarloResult(
+        price=price,
+        std_error=std_error,
+        num_paths=num_paths,
+        elapsed=time.perf_counter() - start,
+        converged=True,
+        stop_reason='num_simulations',
+        variance_reduction=variance_reduction,
+    )
+
+EXECUTORS = ("thread", "process")
+
+def _simulate_shard(option_type, S, K, T, r, sigma, q, num_paths, seed_sequence, chunk_size, sampling, num_steps,
+                    pool_slice=None):
+
+    # Runs inside a worker: its own generator (or its slice of the memory-mapped random-number pool),
+    # fixed-size chunks, and only the running moments are returned
+    rng = np.random.default_rng(seed_sequence)
+    normals = pooled_normals(*pool_slice)[pool_slice[1] - num_paths:] if pool_slice is not None else None
+    stats = RunningStats()
+    for start in range(0, num_paths, chunk_size):
+        size = min(chunk_size, num_paths - start)
+        random_numbers = normals[start:start + size] if normals is not None else None
+        stats.update(discounted_payoffs(option_type, S, K, T, r, sigma, q, size, random_numbers=random_numbers,
+                                        sampling=sampling, num_steps=num_steps, seed=rng))
+    return stats.count, stats.mean, stats.m2
+
+def monte_carlo_parallel(option_type, S, K, T, r, sigma, q=0, num_simulations=10000, num_workers=None,
+                         executor="thread", chunk_size=100_000, sampling="exact", num_steps=365, seed=None):
+
+    # Input validation
+    _validate_inputs(option_type, S, K, T, sigma, num_simulations)
+    if executor not in EXECUTORS:
+        raise ValueError(f"Invalid executor. Use one of {EXECUTORS}.")
+    num_workers = num_workers or os.cpu_count() or 1
+    num_workers = max(1, min(num_workers, num_simulations))
+
+    # Independent, reproducible streams: one child SeedSequence per worker
+    children = np.random.SeedSequence(seed).spawn(num_workers)
+    shard_sizes = [num_simulations // num_workers + (i < num_simulations % num_workers) for i in range(num_workers)]
+
+    # With a seeded exact run the shards read consecutive slices of one pool instead, created here once
+    # and memory-mapped by every worker, so the estimate is that of the serial run whatever the worker count
+    pooled = sampling == "exact" and pooled_normals(seed, num_simulations) is not None
+    pool_ends = np.cumsum(shard_sizes).tolist()
+
+    start = time.perf_counter()
+    if executor == "thread":
+        pool_class = ThreadPoolExecutor
+    else:
+        # multiprocessing is comparatively slow to import, so only load it when a process pool is requested
+        from concurrent.futures import ProcessPoolExecutor as pool_class
+    with pool_class(max_workers=num_workers) as pool:
+        futures = [pool.submit(_simulate_shard, option_type, S, K, T, r, sigma, q, size, child, chunk_size,
+                               sampling, num_steps, (seed, end) if pooled else None)
+                   for size, child, end in zip(shard_sizes, children, pool_ends)]
+        partials = [future.result() for future in futures]
+
+    # Merge in worker order so the result is bit-identical for a given seed and worker count (and, with
+    # pooled normals, equal to the serial estimate up to rounding)
+    stats = RunningStats()
+    for partial in partials:
+        stats.merge(RunningStats(*partial))
+
+    return MonteCarloResult(
+        price=stats.mean,
+        std_error=stats.std_error,
+        num_paths=stats.count,
+        elapsed=time.perf_counter() - start,
+        converged=True,
+        stop_reason='num_simulations',
+    )
+
+def simulate_option_value_paths(option_type, S, K, T, r, sigma, q=0, num_paths=10, num_steps=365, seed=None):
+
+    # Input validation
+    _validate_inputs(option_type, S, K, T, sigma, num_paths)
+
+    # All stock paths at once: one (num_paths, num_steps + 1) array starting at S
+    rng = np.random.default_rng(seed)
+    dt = T / num_steps
+    increments = (r - q - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * rng.standard_normal((num_paths, num_steps))
+    log_paths = np.zeros((num_paths, num_steps + 1))
+    np.cumsum(increments, axis=1, out=log_paths[:, 1:])
+    stock_paths = S * np.exp(log_paths)
+
+    # Value the option at every node in one broadcast Black-Scholes call; the final node is the payoff
+    time_to_expiry = (num_steps - np.arange(num_steps + 1)) * dt
+    option_values = np.empty_like(stock_paths)
+    option_values[:, :-1] = black_scholes_vectorized(option_type, stock_paths[:, :-1], K, time_to_expiry[:-1],
+                                                     r, sigma, q)
+    option_values[:, -1] = option_payoffs(option_type, stock_paths[:, -1], K)
+
+    return time_to_expiry, stock_paths, option_values
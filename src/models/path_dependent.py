@@ -0,0 +1,221 @@
+import time
+
+import numpy as np
+from src.models.distributions import norm_cdf
+from src.models.monte_carlo import STEP_BLOCK_SIZE, MonteCarloResult, _validate_inputs
+from src.utils import instrumentation
+
+AVERAGES = ("arithmetic", "geometric")
+BARRIER_TYPES = ("down-and-out", "down-and-in", "up-and-out", "up-and-in")
+LOOKBACK_STRIKES = ("fixed", "floating")
+
+def _validate_path_inputs(option_type, S, K, T, sigma, num_simulations, num_steps):
+    _validate_inputs(option_type, S, K, T, sigma, num_simulations)
+    if sigma == 0:
+        raise ValueError("Volatility (sigma) must be greater than zero for path-dependent pricing.")
+    if not isinstance(num_steps, (int, np.integer)) or num_steps <= 0:
+        raise ValueError("num_steps must be a positive integer.")
+
+def _log_price_blocks(S, T, r, sigma, q, num_simulations, num_steps, rng):
+
+    # Log-spot at the fixings t_i = i * T / num_steps, a block of time steps at a time: each block is a
+    # (steps, paths) slab, yielded together with the log-spot at the fixing just before it (callers may
+    # overwrite the slab). The normals are drawn in the same blocks as stepped sampling in
+    # monte_carlo_simulation, so for a given seed the terminal prices are those of the stepped vanilla
+    # estimator (common random numbers)
+    dt = T / num_steps
+    drift = (r - q - 0.5 * sigma ** 2) * dt
+    volatility = sigma * np.sqrt(dt)
+    block_steps = max(1, min(num_steps, STEP_BLOCK_SIZE // num_simulations))
+    previous = np.full(num_simulations, np.log(S))
+    for start in range(0, num_steps, block_steps):
+        block = rng.standard_normal((min(block_steps, num_steps - start), num_simulations))
+        block *= volatility
+        block += drift
+        block[0] += previous
+        np.cumsum(block, axis=0, out=block)
+        last = block[-1].copy()
+        yield previous, block
+        previous = last
+
+def _estimate(payoffs, start, control=None, control_mean=None):
+
+    # Sample mean and standard error, optionally net of a control variate with a known expectation
+    plain_variance = payoffs.var(ddof=1)
+    if control is not None:
+        centred = control - control.mean()
+        beta = float(np.dot(centred, payoffs - payoffs.mean()) / np.dot(centred, centred))
+        payoffs = payoffs - beta * (control - control_mean)
+    variance = payoffs.var(ddof=1)
+    return MonteCarloResult(
+        price=float(payoffs.mean()),
+        std_error=float(np.sqrt(variance / payoffs.size)),
+        num_paths=payoffs.size,
+        elapsed=time.perf_counter() - start,
+        converged=True,
+        stop_reason='num_simulations',
+        variance_reduction=float(plain_variance / variance) if variance > 0 else float('inf'),
+    )
+
+def _vanilla_payoffs(option_type, prices, K):
+    if option_type == "Call":
+        return np.maximum(prices - K, 0)
+    return np.maximum(K - prices, 0)
+
+def geometric_asian_price(option_type, S, K, T, r, sigma, q=0, num_steps=365):
+
+    # Closed form for the discretely monitored geometric average over the fixings i * T / num_steps:
+    # its log is normal with the mean and variance below, so the price is a Black-Scholes-type formula
+    sign = np.where(np.asarray(option_type) == "Call", 1.0, -1.0)
+    S, K, T, r, sigma, q = (np.asarray(x, dtype=float) for x in (S, K, T, r, sigma, q))
+    dt = T / num_steps
+    mean = np.log(S) + (r - q - 0.5 * sigma ** 2) * dt * (num_steps + 1) / 2
+    variance = sigma ** 2 * dt * (num_steps + 1) * (2 * num_steps + 1) / (6 * num_steps)
+    d1 = (mean - np.log(K) + variance) / np.sqrt(variance)
+    d2 = d1 - np.sqrt(variance)
+    price = sign * np.exp(-r * T) * (np.exp(mean + variance / 2) * norm_cdf(sign * d1) - K * norm_cdf(sign * d2))
+    return float(price) if np.ndim(price) == 0 else price
+
+def asian_option(option_type, S, K, T, r, sigma, q=0, num_simulations=10000, num_steps=365, average="arithmetic",
+                 control_variate=True, seed=None):
+
+    # Input validation
+    _validate_path_inputs(option_type, S, K, T, sigma, num_simulations, num_steps)
+    if average not in AVERAGES:
+        raise ValueError(f"Invalid average. Use one of {AVERAGES}.")
+    instrumentation.count('simulated_paths', num_simulations)
+
+    # Running sums of the spot and the log-spot over the fixings are all that is kept per path
+    start = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    price_sum = np.zeros(num_simulations)
+    log_sum = np.zeros(num_simulations)
+    for _, block in _log_price_blocks(S, T, r, sigma, q, num_simulations, num_steps, rng):
+        log_sum += block.sum(axis=0)
+        if average == "arithmetic":
+            price_sum += np.exp(block).sum(axis=0)
+
+    discount = np.exp(-r * T)
+    geometric = discount * _vanilla_payoffs(option_type, np.exp(log_sum / num_steps), K)
+    if average == "geometric":
+        return _estimate(geometric, start)
+
+    # The geometric average moves almost in lockstep with the arithmetic one and has an exact price,
+    # which makes it a near-perfect control variate
+    arithmetic = discount * _vanilla_payoffs(option_type, price_sum / num_steps, K)
+    if not control_variate:
+        return _estimate(arithmetic, start)
+    return _estimate(arithmetic, start, geometric, geometric_asian_price(option_type, S, K, T, r, sigma, q, num_steps))
+
+def barrier_option(option_type, S, K, T, r, sigma, q=0, barrier=None, barrier_type="down-and-out",
+                   num_simulations=10000, num_steps=365, bridge_correction=True, seed=None):
+
+    # Input validation
+    _validate_path_inputs(option_type, S, K, T, sigma, num_simulations, num_steps)
+    if barrier_type not in BARRIER_TYPES:
+        raise ValueError(f"Invalid barrier type. Use one of {BARRIER_TYPES}.")
+    if barrier is None or barrier <= 0:
+        raise ValueError("barrier must be greater than zero.")
+    down = barrier_type.startswith("down")
+    if (down and barrier >= S) or (not down and barrier <= S):
+        raise ValueError(f"A {barrier_type} barrier must be {'below' if down else 'above'} the spot price.")
+    instrumentation.count('simulated_paths', num_simulations)
+
+    # Each path carries the probability that it has not touched the barrier yet. Between two fixings on
+    # the same side of the barrier, the Brownian bridge crosses it with probability
+    # exp(-2 a0 a1 / (sigma^2 dt)), where a0 and a1 are the log-distances to the barrier; without the
+    # correction the barrier is only monitored at the fixings
+    start = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    log_barrier = np.log(barrier)
+    bridge_scale = -2 / (sigma ** 2 * T / num_steps)
+    survival = np.ones(num_simulations)
+    for previous, block in _log_price_blocks(S, T, r, sigma, q, num_simulations, num_steps, rng):
+
+        # Signed log-distances to the barrier, positive on the live side, written over the slab
+        if down:
+            block -= log_barrier
+            previous = previous - log_barrier
+        else:
+            np.subtract(log_barrier, block, out=block)
+            previous = log_barrier - previous
+        terminal = log_barrier + block[-1] if down else log_barrier - block[-1]
+        if not bridge_correction:
+            survival *= np.all(block > 0, axis=0)
+            continue
+
+        # a0 * a1 <= 0 means the fixing itself is past the barrier, which zeroes the survival factor; once
+        # a path has knocked out its survival stays at zero whatever the later factors are
+        factors = np.empty_like(block)
+        np.multiply(block[0], previous, out=factors[0])
+        np.multiply(block[1:], block[:-1], out=factors[1:])
+        np.maximum(factors, 0, out=factors)
+        factors *= bridge_scale
+        np.expm1(factors, out=factors)
+        np.negative(factors, out=factors)
+        survival *= factors.prod(axis=0)
+
+    # Knock-in = vanilla - knock-out path by path, so both use the same conditional survival weights
+    vanilla = np.exp(-r * T) * _vanilla_payoffs(option_type, np.exp(terminal), K)
+    weights = survival if barrier_type.endswith("out") else 1 - survival
+    return _estimate(vanilla * weights, start)
+
+def floating_lookback_price(option_type, S, T, r, sigma, q=0):
+
+    # Goldman-Sosin-Gatto closed form for a continuously monitored floating-strike lookback started today
+    # (running minimum/maximum equal to the spot), in the cost-of-carry form with b = r - q != 0
+    b = r - q
+    if b == 0:
+        raise ValueError("The closed form needs r != q.")
+    sqrt_T = np.sqrt(T)
+    a1 = (b + 0.5 * sigma ** 2) * T / (sigma * sqrt_T)
+    a2 = a1 - sigma * sqrt_T
+    carry = 0.5 * sigma ** 2 / b
+    if option_type == "Call":
+        return float(S * np.exp(-q * T) * norm_cdf(a1) - S * np.exp(-r * T) * norm_cdf(a2)
+                     + S * np.exp(-r * T) * carry * (norm_cdf(-a1 + 2 * b * sqrt_T / sigma)
+                                                     - np.exp(b * T) * norm_cdf(-a1)))
+    return float(S * np.exp(-r * T) * norm_cdf(-a2) - S * np.exp(-q * T) * norm_cdf(-a1)
+                 + S * np.exp(-r * T) * carry * (-norm_cdf(a1 - 2 * b * sqrt_T / sigma)
+                                                 + np.exp(b * T) * norm_cdf(a1)))
+
+def lookback_option(option_type, S, K, T, r, sigma, q=0, num_simulations=10000, num_steps=365, strike="fixed",
+                    bridge_correction=False, seed=None):
+
+    # Input validation (K is only used by the fixed-strike lookback)
+    _validate_path_inputs(option_type, S, K, T, sigma, num_simulations, num_steps)
+    if strike not in LOOKBACK_STRIKES:
+        raise ValueError(f"Invalid lookback strike. Use one of {LOOKBACK_STRIKES}.")
+    instrumentation.count('simulated_paths', num_simulations)
+
+    # Fixed strike pays on the best (call) or worst (put) level; floating strike buys at the low (call)
+    # or sells at the high (put), so each contract only needs one running extreme
+    use_maximum = (option_type == "Call") == (strike == "fixed")
+
+    # Running extreme of the log-spot, starting from today's spot. By default the extreme is taken over
+    # the fixings; with the bridge correction the extreme between two fixings is sampled from the
+    # Brownian bridge joining them, (x0 + x1 +/- sqrt((x1 - x0)^2 - 2 sigma^2 dt log U)) / 2, so the
+    # price is that of a continuously monitored lookback
+    start = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    bridge_variance = 2 * sigma ** 2 * T / num_steps
+    extreme = np.full(num_simulations, np.log(S))
+    for previous, block in _log_price_blocks(S, T, r, sigma, q, num_simulations, num_steps, rng):
+        terminal = block[-1].copy()
+        if bridge_correction:
+            starts = np.concatenate([previous[None], block[:-1]])
+            spread = np.sqrt((block - starts) ** 2 - bridge_variance * np.log1p(-rng.random(block.shape)))
+            block += starts
+            block += spread if use_maximum else -spread
+            block *= 0.5
+        if use_maximum:
+            np.maximum(extreme, block.max(axis=0), out=extreme)
+        else:
+            np.minimum(extreme, block.min(axis=0), out=extreme)
+
+    extreme = np.exp(extreme)
+    if strike == "fixed":
+        payoffs = _vanilla_payoffs(option_type, extreme, K)
+    else:
+        payoffs = np.abs(np.exp(terminal) - extreme)
+    return _estimate(np.exp(-r * T) * payoffs, start)
@@ -0,0 +1,174 @@
+import getpass
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+# Standard normals for a given integer seed are generated once with np.random.default_rng(seed), stored
+# as a .npy file and memory-mapped read-only by every caller, so repeated runs, sweeps and worker
+# processes share the same numbers (common random numbers) without paying for the generator again.
+# The pool holds the exact stream default_rng(seed).standard_normal(n) would produce, so pooled and
+# freshly drawn numbers are interchangeable. Set OPTIONS_RANDOM_POOL=0 to disable, and
+# OPTIONS_RANDOM_POOL_DIR to move the files out of the (per-user) system temporary directory. If the
+# directory cannot be written the numbers are simply drawn afresh
+ENV_POOL = 'OPTIONS_RANDOM_POOL'
+ENV_POOL_DIR = 'OPTIONS_RANDOM_POOL_DIR'
+
+# Pools grow in powers of two from MIN_POOL_SIZE; requests beyond MAX_POOL_SIZE (64 MiB) are drawn directly
+MIN_POOL_SIZE = 2 ** 20
+MAX_POOL_SIZE = 2 ** 23
+
+# Disk budget of the pool directory: least recently used pool files are removed beyond these limits
+MAX_POOL_FILES = 8
+MAX_POOL_BYTES = 256 * 1024 ** 2
+
+# Normals written per generator call while a pool file is filled, which bounds memory during creation
+FILL_CHUNK_SIZE = 2 ** 20
+
+_pools = {}
+_lock = threading.Lock()
+_enabled = None
+
+def set_pool_enabled(enabled):
+    global _enabled
+    _enabled = bool(enabled)
+    return _enabled
+
+def pool_enabled():
+
+    # Resolved on first use, like the numeric backend
+    if _enabled is None:
+        return set_pool_enabled(os.environ.get(ENV_POOL, "1").strip().lower() not in ("0", "false", "no", "off"))
+    return _enabled
+
+def _user_name():
+    try:
+        return getpass.getuser()
+    except Exception:
+        return 'default'
+
+def pool_directory():
+    return os.environ.get(ENV_POOL_DIR) or os.path.join(tempfile.gettempdir(), f'options_random_pool_{_user_name()}')
+
+def _pool_path(seed):
+    return os.path.join(pool_directory(), f'normals_seed{seed}.npy')
+
+def _write_pool(path, seed, size):
+
+    # Fill a temporary file in the pool directory chunk by chunk, then move it into place atomically so
+    # that concurrent readers (other threads or processes) only ever see a complete pool
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    handle, temporary = tempfile.mkstemp(suffix='.npy', dir=os.path.dirname(path))
+    os.close(handle)
+    try:
+        rng = np.random.default_rng(seed)
+        pool = np.lib.format.open_memmap(temporary, mode='w+', dtype=np.float64, shape=(size,))
+        for start in range(0, size, FILL_CHUNK_SIZE):
+            rng.standard_normal(out=pool[start:start + FILL_CHUNK_SIZE])
+        pool.flush()
+        del pool
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+def _pool_files():
+    directory = pool_directory()
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    return [os.path.join(directory, name) for name in names if name.startswith('normals_seed') and name.endswith('.npy')]
+
+def _evict(keep):
+
+    # Least recently used first (opening a pool refreshes its modification time); files mapped by this or
+    # another process stay readable after removal, so eviction never breaks a running caller
+    files = []
+    for path in _pool_files():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+    files.sort(reverse=True)
+    total = 0
+    for count, (_, size, path) in enumerate(files, start=1):
+        total += size
+        if path != keep and (count > MAX_POOL_FILES or total > MAX_POOL_BYTES):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def _open_pool(path):
+    try:
+        pool = np.load(path, mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+    if pool.dtype != np.float64 or pool.ndim != 1:
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return pool
+
+def _is_seed(seed):
+    return isinstance(seed, (int, np.integer)) and not isinstance(seed, bool) and seed >= 0
+
+def pooled_normals(seed, size):
+
+    # Read-only view of the first `size` normals of the pool for `seed`, or None when the request cannot
+    # be pooled (pooling disabled, no integer seed, more numbers than MAX_POOL_SIZE, or no writable
+    # pool directory). The lock only guards the map of open pools; files are opened and written outside
+    # it, and a concurrent writer of the same seed writes identical numbers
+    if not pool_enabled() or not _is_seed(seed) or size > MAX_POOL_SIZE:
+        return None
+    seed = int(seed)
+    with _lock:
+        pool = _pools.get(seed)
+    if pool is None or len(pool) < size:
+        path = _pool_path(seed)
+        pool = _open_pool(path)
+        if pool is None or len(pool) < size:
+            try:
+                _write_pool(path, seed, max(MIN_POOL_SIZE, 1 << (int(size) - 1).bit_length()))
+            except OSError:
+                return None
+            _evict(keep=path)
+            pool = _open_pool(path)
+            if pool is None or len(pool) < size:
+                return None
+        with _lock:
+            current = _pools.get(seed)
+            if current is None or len(current) < len(pool):
+                _pools.pop(seed, None)
+                _pools[seed] = pool
+
+                # Keep at most as many maps open as the directory keeps files
+                while len(_pools) > MAX_POOL_FILES:
+                    _pools.pop(next(iter(_pools)))
+    return pool[:size]
+
+def standard_normals(seed, size):
+
+    # Pooled normals when possible, otherwise a fresh draw of the same stream
+    pool = pooled_normals(seed, size)
+    if pool is not None:
+        return pool
+    return np.random.default_rng(seed).standard_normal(size)
+
+def clear_pools(remove_files=False):
+
+    # Forget the memory maps of this process, and optionally delete the pool files themselves
+    with _lock:
+        _pools.clear()
+    if remove_files:
+        for path in _pool_files():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
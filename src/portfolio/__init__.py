@@ -0,0 +1,6 @@
+from .batch import price_portfolio, price_file, read_contracts, write_results
+from .scenarios import ScenarioEngine, scenario_ladder
+from .streaming import TickStreamUpdater, read_ticks
+
+__all__ = ['price_portfolio', 'price_file', 'read_contracts', 'write_results', 'ScenarioEngine', 'scenario_ladder',
+           'TickStreamUpdater', 'read_ticks']
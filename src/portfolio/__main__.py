@@ -0,0 +1,22 @@
+import argparse
+
+from src.portfolio.batch import MODELS, price_file
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m src.portfolio',
+        description='Price a CSV or Parquet file of option contracts and write the price and all twelve Greeks.'
+    )
+    parser.add_argument('input', help='contracts file with columns type, S, K, T, r, sigma, q [, num_simulations]')
+    parser.add_argument('-o', '--output', required=True, help='output file (.csv or .parquet)')
+    parser.add_argument('-m', '--model', choices=MODELS, default='black_scholes', help='pricing model')
+    parser.add_argument('-n', '--num-simulations', type=int, default=10000,
+                        help='Monte Carlo paths for rows without a num_simulations value')
+    parser.add_argument('--seed', type=int, default=None, help='random seed for Monte Carlo')
+    args = parser.parse_args(argv)
+
+    rows, elapsed = price_file(args.input, args.output, args.model, args.num_simulations, args.seed)
+    print(f'Priced {rows:,} contracts with {args.model} in {elapsed:.2f}s -> {args.output}')
+
+if __name__ == '__main__':
+    main()
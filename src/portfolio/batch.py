@@ -0,0 +1,75 @@
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from src.greeks.calculate_greeks import GreeksResult, black_scholes_greeks, monte_carlo_greeks
+from src.models.contracts import MC_BLOCK_SIZE, contract_arrays
+
+RESULT_COLUMNS = list(GreeksResult.__slots__)
+MODELS = ('black_scholes', 'monte_carlo')
+
+def read_contracts(path):
+    path = Path(path)
+    if path.suffix.lower() in ('.parquet', '.pq'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+def write_results(results, path):
+    path = Path(path)
+    if path.suffix.lower() in ('.parquet', '.pq'):
+        results.to_parquet(path, index=False)
+    else:
+        results.to_csv(path, index=False)
+
+def _price_black_scholes(columns):
+    greeks = black_scholes_greeks(columns['type'], columns['S'], columns['K'], columns['T'],
+                                  columns['r'], columns['sigma'], columns['q'])
+    return {name: np.asarray(value) for name, value in greeks.as_dict().items()}
+
+def _price_monte_carlo(columns, num_simulations, rng):
+    n_rows = len(columns['S'])
+    output = {name: np.empty(n_rows) for name in RESULT_COLUMNS + ['price_std_error']}
+
+    # Contracts sharing a path count are priced together in row blocks that bound memory
+    for paths in np.unique(num_simulations):
+        rows = np.flatnonzero(num_simulations == paths)
+        block = max(1, MC_BLOCK_SIZE // int(paths))
+        for start in range(0, len(rows), block):
+            index = rows[start:start + block]
+            greeks, errors = monte_carlo_greeks(
+                columns['type'][index], columns['S'][index], columns['K'][index], columns['T'][index],
+                columns['r'][index], columns['sigma'][index], columns['q'][index],
+                int(paths), random_numbers=rng.standard_normal(int(paths)))
+            for name in RESULT_COLUMNS:
+                output[name][index] = getattr(greeks, name)
+            output['price_std_error'][index] = errors.price
+    return output
+
+def price_portfolio(contracts, model='black_scholes', num_simulations=10000, seed=None):
+
+    if model not in MODELS:
+        raise ValueError(f"Invalid model. Use one of {MODELS}.")
+    columns = contract_arrays(contracts)
+
+    if model == 'black_scholes':
+        priced = _price_black_scholes(columns)
+    else:
+        # An optional num_simulations column overrides the default path count row by row
+        if 'num_simulations' in contracts.columns:
+            paths = contracts['num_simulations'].fillna(num_simulations).to_numpy(dtype=np.int64)
+        else:
+            paths = np.full(len(contracts), num_simulations, dtype=np.int64)
+        priced = _price_monte_carlo(columns, paths, np.random.default_rng(seed))
+
+    results = contracts.copy()
+    for name, values in priced.items():
+        results[name] = values
+    return results
+
+def price_file(input_path, output_path, model='black_scholes', num_simulations=10000, seed=None):
+    start = time.perf_counter()
+    contracts = read_contracts(input_path)
+    results = price_portfolio(contracts, model, num_simulations, seed)
+    write_results(results, output_path)
+    return len(results), time.perf_counter() - start
@@ -0,0 +1,118 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+from src.greeks.calculate_greeks import black_scholes_greeks
+from src.models.black_scholes import black_scholes_vectorized, option_type_mask
+from src.models.cache import LRUCache
+from src.models.contracts import contract_arrays
+
+SCENARIO_COLUMNS = ['spot_shock', 'vol_shock', 'rate_shock_bp', 'time_decay']
+
+# Upper bound on positions x scenarios revalued at once, which bounds peak memory for any book size
+SCENARIO_BLOCK_SIZE = 1_000_000
+
+# Shocked volatility and time to expiry are floored here; at the time floor an option is worth its intrinsic value
+MIN_VOLATILITY = 1e-8
+MIN_TIME = 1e-10
+
+# Scenario P&Ls remembered per engine; the least recently used are dropped beyond this, so a long-lived
+# engine serving many ladders and grids keeps bounded memory
+MAX_CACHED_SCENARIOS = 100_000
+
+def _scenario_key(spot_shock, vol_shock, rate_shock_bp, time_decay):
+    return tuple(round(float(x), 12) for x in (spot_shock, vol_shock, rate_shock_bp, time_decay))
+
+class ScenarioEngine:
+
+    # Full-revaluation P&L ladders for a book of European options under spot (relative), volatility
+    # (absolute), rate (basis points) and time-decay (years) shocks. P&L is memoized per scenario (the most
+    # recently used max_cached_scenarios of them), so when a ladder changes along one axis only the new
+    # combinations are revalued
+    def __init__(self, contracts, block_size=SCENARIO_BLOCK_SIZE, max_cached_scenarios=MAX_CACHED_SCENARIOS):
+        columns = contract_arrays(contracts)
+        self.option_type = columns['type']
+        self.is_call = option_type_mask(self.option_type)
+        self.S, self.K, self.T = columns['S'], columns['K'], columns['T']
+        self.r, self.sigma, self.q = columns['r'], columns['sigma'], columns['q']
+        if 'quantity' in contracts.columns:
+            self.quantity = contracts['quantity'].fillna(1.0).to_numpy(dtype=float)
+        else:
+            self.quantity = np.ones(len(contracts))
+        self.block_size = block_size
+
+        # Base prices and the book-level sensitivities used by the Taylor approximation
+        greeks = black_scholes_greeks(self.is_call, self.S, self.K, self.T, self.r, self.sigma, self.q)
+        self.base_price = np.atleast_1d(greeks.price)
+        self.base_value = float(np.sum(self.quantity * self.base_price))
+        self.cash_delta = float(np.sum(self.quantity * greeks.delta * self.S))
+        self.cash_gamma = float(np.sum(self.quantity * greeks.gamma * self.S ** 2))
+        self.vega = float(np.sum(self.quantity * greeks.vega))
+        self.rho = float(np.sum(self.quantity * greeks.rho))
+        self.theta = float(np.sum(self.quantity * greeks.theta))
+        self._pnl = LRUCache(max_cached_scenarios)
+
+    @property
+    def num_positions(self):
+        return len(self.S)
+
+    def revalue(self, scenarios):
+
+        # scenarios: (n, 4) array of (spot_shock, vol_shock, rate_shock_bp, time_decay). Positions run
+        # down the rows and scenarios across the columns of each broadcast block
+        scenarios = np.atleast_2d(np.asarray(scenarios, dtype=float))
+        spot, vol, rate, decay = (scenarios[:, i] for i in range(4))
+        if np.any(spot <= -1):
+            raise ValueError("Spot shocks must be greater than -100%.")
+        pnl = np.zeros(len(scenarios))
+        rows = max(1, self.block_size // max(1, len(scenarios)))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for start in range(0, self.num_positions, rows):
+                block = slice(start, start + rows)
+                S, K, T = self.S[block, None], self.K[block, None], self.T[block, None]
+                r, sigma, q = self.r[block, None], self.sigma[block, None], self.q[block, None]
+                shocked = black_scholes_vectorized(
+                    self.is_call[block, None], S * (1 + spot), K, np.maximum(T - decay, MIN_TIME),
+                    r + rate / 1e4, np.maximum(sigma + vol, MIN_VOLATILITY), q
+                )
+                pnl += self.quantity[block] @ (shocked - self.base_price[block, None])
+        return pnl
+
+    def approximate(self, scenarios):
+
+        # Delta-gamma-vega expansion from the base Greeks, plus the first-order rho and theta terms
+        scenarios = np.atleast_2d(np.asarray(scenarios, dtype=float))
+        spot, vol, rate, decay = (scenarios[:, i] for i in range(4))
+        return (self.cash_delta * spot + 0.5 * self.cash_gamma * spot ** 2 + self.vega * vol
+                + self.rho * rate / 1e4 + self.theta * decay)
+
+    def ladder(self, spot_shocks=(0.0,), vol_shocks=(0.0,), rate_shocks_bp=(0.0,), time_decays=(0.0,)):
+
+        # Every combination of the four axes, one row per scenario
+        grid = [_scenario_key(*scenario)
+                for scenario in itertools.product(spot_shocks, vol_shocks, rate_shocks_bp, time_decays)]
+
+        # Remembered P&Ls are collected first, so a grid larger than the memo is still served in one pass
+        pnl = {}
+        for key in dict.fromkeys(grid):
+            found, value = self._pnl.get(key)
+            if found:
+                pnl[key] = value
+        missing = [key for key in dict.fromkeys(grid) if key not in pnl]
+        if missing:
+            for key, value in zip(missing, self.revalue(missing).tolist()):
+                pnl[key] = value
+                self._pnl.put(key, value)
+
+        scenarios = np.array(grid, dtype=float).reshape(-1, 4)
+        ladder = pd.DataFrame(scenarios, columns=SCENARIO_COLUMNS)
+        ladder['pnl'] = [pnl[key] for key in grid]
+        ladder['approx_pnl'] = self.approximate(scenarios)
+        ladder['value'] = self.base_value + ladder['pnl']
+        return ladder
+
+    def clear(self):
+        self._pnl.clear()
+
+def scenario_ladder(contracts, spot_shocks=(0.0,), vol_shocks=(0.0,), rate_shocks_bp=(0.0,), time_decays=(0.0,)):
+    return ScenarioEngine(contracts).ladder(spot_shocks, vol_shocks, rate_shocks_bp, time_decays)
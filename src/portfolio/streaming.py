@@ -0,0 +1,250 @@
+import csv
+import time
+from datetime import datetime
+
+import numpy as np
+from src.greeks.calculate_greeks import black_scholes_greeks
+from src.models.black_scholes import option_type_mask
+from src.models.contracts import contract_arrays
+
+SECONDS_PER_YEAR = 365 * 24 * 60 * 60
+TICK_COLUMNS = ['timestamp', 'underlying', 'price']
+DEFAULT_UNDERLYING = 'UNDERLYING'
+
+# Time to expiry is floored here once positions reach expiry during a replay
+MIN_TIME = 1e-10
+
+def _to_seconds(timestamp):
+    if isinstance(timestamp, (int, float, np.integer, np.floating)):
+        return float(timestamp)
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    text = str(timestamp)
+    try:
+        return float(text)
+    except ValueError:
+        return datetime.fromisoformat(text).timestamp()
+
+def read_ticks(path):
+
+    # Replay file: CSV with timestamp (epoch seconds or ISO 8601), underlying and price columns
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            yield row['timestamp'], row['underlying'], float(row['price'])
+
+TAYLOR_GREEKS = ('price', 'delta', 'gamma', 'theta', 'vega', 'charm', 'speed', 'volga', 'vanna', 'veta')
+
+# Greeks of the leading terms the Taylor step leaves out, whose largest magnitudes drive the error estimate
+ERROR_GREEKS = ('speed', 'volga', 'vanna', 'charm', 'veta')
+
+# Time decay is only expanded to first order, so a valuation is refreshed at least this often (seconds)
+DEFAULT_MAX_AGE = 60 * 60
+
+class _UnderlyingState:
+    # Expansion point shared by every position on one underlying: spot, volatility shift and time of the
+    # last full valuation, the per-position Greeks there, and their quantity-weighted sums
+    __slots__ = ('index', 'spot', 'anchor_spot', 'vol_shift', 'anchor_vol_shift', 'anchor_time', 'greeks',
+                 'totals', 'largest', 'anchored')
+
+    def __init__(self, index, spot):
+        self.index = index
+        self.spot = spot
+        self.anchor_spot = spot
+        self.vol_shift = 0.0
+        self.anchor_vol_shift = 0.0
+        self.anchor_time = 0.0
+        self.greeks = {}
+        self.totals = {}
+        self.largest = dict.fromkeys(ERROR_GREEKS, 0.0)
+        self.anchored = False
+
+class TickStreamUpdater:
+
+    # Keeps position values and Deltas current under a stream of underlying ticks. Each tick is applied
+    # with a second-order Taylor step around the last full valuation of its underlying (Delta, Gamma, Theta
+    # and Charm for spot and time, Vega for volatility shifts). Only scalars are touched per tick: the
+    # book value comes from quantity-weighted Greek sums and position-level values are expanded on demand.
+    # An underlying is fully repriced once the estimated truncation error per unit exceeds error_tolerance,
+    # spot has moved more than move_threshold since the last reprice, or that valuation is older than
+    # max_age seconds (None never ages it). The estimate is the size of the leading omitted terms, Speed *
+    # dS^3 / 6 + Volga * dvol^2 / 2 + Vanna * dS * dvol + Charm * dS * dt + Veta * dvol * dt, each with
+    # the largest magnitude of that Greek among the underlying's positions at the expansion point; it is
+    # not a bound (higher-order terms and the second-order time decay are not in it, hence max_age)
+    def __init__(self, contracts, error_tolerance=0.01, move_threshold=0.02, max_age=DEFAULT_MAX_AGE):
+        if error_tolerance <= 0 or move_threshold <= 0:
+            raise ValueError("error_tolerance and move_threshold must be positive.")
+        if max_age is not None and max_age <= 0:
+            raise ValueError("max_age must be positive, or None to never reprice on age.")
+        columns = contract_arrays(contracts)
+        self.is_call = option_type_mask(columns['type'])
+        self.S, self.K, self.T = columns['S'], columns['K'], columns['T']
+        self.r, self.sigma, self.q = columns['r'], columns['sigma'], columns['q']
+        if 'quantity' in contracts.columns:
+            self.quantity = contracts['quantity'].fillna(1.0).to_numpy(dtype=float)
+        else:
+            self.quantity = np.ones(len(contracts))
+        self.error_tolerance = error_tolerance
+        self.move_threshold = move_threshold
+        self.max_age = max_age
+
+        self.start_time = None
+        self.now = 0.0
+        self.ticks = 0
+        self.reprices = 0
+        self.reprice_reasons = {'initial': 0, 'error_estimate': 0, 'move': 0, 'age': 0, 'forced': 0}
+        self.max_estimated_error = 0.0
+        self.busy_time = 0.0
+
+        # Positions are grouped by underlying so a tick only touches the state it moves
+        names = (contracts['underlying'].astype(str).to_numpy() if 'underlying' in contracts.columns
+                 else np.full(len(contracts), DEFAULT_UNDERLYING))
+        self.underlyings = {}
+        for name in dict.fromkeys(names.tolist()):
+            index = np.flatnonzero(names == name)
+            state = _UnderlyingState(index, float(self.S[index[0]]))
+            self._reprice(state, self.S[index])
+
+            # Positions quoted at different spots are valued at their own spot until the first tick,
+            # which then reprices them all at the traded price
+            state.anchored = bool(np.all(self.S[index] == state.spot))
+            self.underlyings[name] = state
+
+    def _reprice(self, state, spot=None):
+
+        # Full vectorized valuation of one underlying, which becomes its new expansion point
+        index = state.index
+        T = np.maximum(self.T[index] - self.now / SECONDS_PER_YEAR, MIN_TIME)
+        greeks = black_scholes_greeks(self.is_call[index], state.spot if spot is None else spot, self.K[index], T,
+                                      self.r[index], self.sigma[index] + state.vol_shift, self.q[index])
+        state.greeks = {name: np.atleast_1d(getattr(greeks, name)) for name in TAYLOR_GREEKS}
+        state.totals = {name: float(self.quantity[index] @ values) for name, values in state.greeks.items()}
+        state.largest = {name: float(np.max(np.abs(state.greeks[name]))) for name in ERROR_GREEKS}
+        state.anchor_spot = state.spot
+        state.anchor_vol_shift = state.vol_shift
+        state.anchor_time = self.now
+        state.anchored = True
+
+    def _steps(self, state):
+        return (state.spot - state.anchor_spot, state.vol_shift - state.anchor_vol_shift,
+                (self.now - state.anchor_time) / SECONDS_PER_YEAR)
+
+    def _check(self, state):
+
+        # Decide from scalars alone whether the Taylor step is still trusted, repricing if not
+        dS, dvol, dt = self._steps(state)
+        dS, dvol, dt = abs(dS), abs(dvol), abs(dt)
+        largest = state.largest
+        error = (largest['speed'] * dS ** 3 / 6 + largest['volga'] * dvol ** 2 / 2 + largest['vanna'] * dS * dvol
+                 + largest['charm'] * dS * dt + largest['veta'] * dvol * dt)
+        self.max_estimated_error = max(self.max_estimated_error, error)
+        if not state.anchored:
+            reason = 'initial'
+        elif error > self.error_tolerance:
+            reason = 'error_estimate'
+        elif abs(dS) > self.move_threshold * state.anchor_spot:
+            reason = 'move'
+        elif self.max_age is not None and self.now - state.anchor_time > self.max_age:
+            reason = 'age'
+        else:
+            return None
+        self._reprice(state)
+        self.reprices += 1
+        self.reprice_reasons[reason] += 1
+        return reason
+
+    def _advance(self, timestamp, underlying):
+        if underlying not in self.underlyings:
+            raise ValueError(f"Unknown underlying: {underlying}")
+        seconds = _to_seconds(timestamp)
+        if self.start_time is None:
+            self.start_time = seconds
+        self.now = max(self.now, seconds - self.start_time)
+        return self.underlyings[underlying]
+
+    def on_tick(self, timestamp, underlying, price):
+
+        # Returns the reprice reason, or None when the tick was absorbed by the Taylor step
+        started = time.perf_counter()
+        if price <= 0:
+            raise ValueError("Tick prices must be greater than zero.")
+        state = self._advance(timestamp, underlying)
+        state.spot = float(price)
+        self.ticks += 1
+        reason = self._check(state)
+        self.busy_time += time.perf_counter() - started
+        return reason
+
+    def on_volatility(self, timestamp, underlying, vol_change):
+
+        # Parallel shift (absolute) of every position's volatility on one underlying
+        started = time.perf_counter()
+        state = self._advance(timestamp, underlying)
+        state.vol_shift += float(vol_change)
+        reason = self._check(state)
+        self.busy_time += time.perf_counter() - started
+        return reason
+
+    def run(self, ticks, callback=None):
+
+        # ticks: any iterable of (timestamp, underlying, price), e.g. read_ticks(path)
+        for timestamp, underlying, price in ticks:
+            reason = self.on_tick(timestamp, underlying, price)
+            if callback is not None:
+                callback(self, underlying, reason)
+        return self.metrics()
+
+    def reprice_all(self):
+        for state in self.underlyings.values():
+            self._reprice(state)
+            self.reprices += 1
+            self.reprice_reasons['forced'] += 1
+
+    def underlying_value(self, underlying):
+        state = self.underlyings[underlying]
+        dS, dvol, dt = self._steps(state)
+        g = state.totals
+        return g['price'] + g['delta'] * dS + 0.5 * g['gamma'] * dS ** 2 + g['theta'] * dt + g['vega'] * dvol
+
+    def underlying_delta(self, underlying):
+        state = self.underlyings[underlying]
+        dS, dvol, dt = self._steps(state)
+        g = state.totals
+        return g['delta'] + g['gamma'] * dS + g['charm'] * dt
+
+    def portfolio_value(self):
+        return sum(self.underlying_value(name) for name in self.underlyings)
+
+    @property
+    def values(self):
+
+        # Per-position (unit) values, expanded from each underlying's expansion point
+        values = np.empty(len(self.S))
+        for state in self.underlyings.values():
+            dS, dvol, dt = self._steps(state)
+            g = state.greeks
+            values[state.index] = (g['price'] + g['delta'] * dS + 0.5 * g['gamma'] * dS ** 2 + g['theta'] * dt
+                                   + g['vega'] * dvol)
+        return values
+
+    @property
+    def deltas(self):
+        deltas = np.empty(len(self.S))
+        for state in self.underlyings.values():
+            dS, dvol, dt = self._steps(state)
+            g = state.greeks
+            deltas[state.index] = g['delta'] + g['gamma'] * dS + g['charm'] * dt
+        return deltas
+
+    @property
+    def spots(self):
+        return {name: state.spot for name, state in self.underlyings.items()}
+
+    def metrics(self):
+        return {
+            'ticks': self.ticks,
+            'reprices': self.reprices,
+            'reprice_rate': self.reprices / self.ticks if self.ticks else 0.0,
+            'reprice_reasons': dict(self.reprice_reasons),
+            'ticks_per_second': self.ticks / self.busy_time if self.busy_time > 0 else 0.0,
+            'max_estimated_error': self.max_estimated_error,
+        }
@@ -0,0 +1,5 @@
+from .server import PricingService, price_batch, greeks_batch, monte_carlo_batch
+from .batching import MicroBatcher
+from .metrics import ServiceMetrics
+
+__all__ = ['PricingService', 'MicroBatcher', 'ServiceMetrics', 'price_batch', 'greeks_batch', 'monte_carlo_batch']
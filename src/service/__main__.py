@@ -0,0 +1,37 @@
+import argparse
+import asyncio
+
+from src.service.server import (
+    DEFAULT_BATCH_WINDOW,
+    DEFAULT_HOST,
+    DEFAULT_MAX_BATCH_SIZE,
+    DEFAULT_PORT,
+    PricingService
+)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m src.service',
+        description='Serve Black-Scholes prices and Greeks and Monte Carlo prices over HTTP/JSON.'
+    )
+    parser.add_argument('--host', default=DEFAULT_HOST, help='interface to bind')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='port to listen on')
+    parser.add_argument('--batch-window', type=float, default=DEFAULT_BATCH_WINDOW * 1000,
+                        help='milliseconds to wait while collecting a micro-batch')
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE,
+                        help='flush a micro-batch once this many requests are waiting')
+    parser.add_argument('--workers', type=int, default=None, help='threads for Monte Carlo batches')
+    args = parser.parse_args(argv)
+
+    service = PricingService(args.batch_window / 1000, args.max_batch_size, args.workers)
+    print(f'Pricing service listening on http://{args.host}:{args.port} '
+          f'(POST /price, /greeks, /monte_carlo; GET /metrics, /stats, /health)')
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+if __name__ == '__main__':
+    main()
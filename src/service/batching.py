@@ -0,0 +1,69 @@
+import asyncio
+
+class MicroBatcher:
+
+    # Collects requests that arrive within `window` seconds (or until max_batch_size are waiting) and
+    # hands them to `process` as one list, so a single vectorized call answers all of them.
+    # `process` returns one result (or exception) per item; with an executor it runs off the event loop
+    def __init__(self, process, window=0.002, max_batch_size=4096, executor=None, on_batch=None):
+        if window < 0:
+            raise ValueError("window must be non-negative.")
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be a positive integer.")
+        self.process = process
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.executor = executor
+        self.on_batch = on_batch
+        self._pending = []
+        self._timer = None
+
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        if self.on_batch is not None:
+            self.on_batch(len(batch))
+
+        items = [item for item, _ in batch]
+        futures = [future for _, future in batch]
+        if self.executor is None:
+            try:
+                _resolve(futures, self.process(items), None)
+            except Exception as error:
+                _resolve(futures, None, error)
+            return
+
+        task = asyncio.get_running_loop().run_in_executor(self.executor, self.process, items)
+        task.add_done_callback(lambda done: _resolve(futures, *_outcome(done)))
+
+def _outcome(task):
+    if task.cancelled():
+        return None, asyncio.CancelledError()
+    error = task.exception()
+    return (None, error) if error is not None else (task.result(), None)
+
+def _resolve(futures, results, error):
+    for index, future in enumerate(futures):
+        if future.done():
+            continue
+        if error is not None:
+            future.set_exception(error)
+        elif isinstance(results[index], Exception):
+            # A process function may fail single items by returning the exception in their slot
+            future.set_exception(results[index])
+        else:
+            future.set_result(results[index])
@@ -0,0 +1,104 @@
+import bisect
+import math
+import threading
+import time
+
+# Upper bounds of the latency (seconds) and batch size histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+
+def _finite(value):
+
+    # JSON has no infinity: a quantile in the overflow bucket is reported as null
+    return value if math.isfinite(value) else None
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'count', 'total')
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, probability):
+
+        # Upper bound of the bucket holding the requested quantile (inf if it lies in the overflow bucket)
+        if self.count == 0:
+            return float('nan')
+        rank = probability * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return bound
+        return float('inf')
+
+    def prometheus_lines(self, name, labels=''):
+        separator = ',' if labels else ''
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels}{separator}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels}{separator}le="+Inf"}} {self.count}')
+        suffix = f'{{{labels}}}' if labels else ''
+        lines.append(f'{name}_sum{suffix} {self.total:.6f}')
+        lines.append(f'{name}_count{suffix} {self.count}')
+        return lines
+
+class ServiceMetrics:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.requests = {}
+        self.errors = {}
+        self.latency = {}
+        self.batch_sizes = {}
+
+    def observe_request(self, endpoint, latency, error=False):
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            if error:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+            self.latency.setdefault(endpoint, Histogram(LATENCY_BUCKETS)).observe(latency)
+
+    def observe_batch(self, endpoint, size):
+        with self._lock:
+            self.batch_sizes.setdefault(endpoint, Histogram(BATCH_SIZE_BUCKETS)).observe(size)
+
+    def snapshot(self):
+        with self._lock:
+            uptime = time.monotonic() - self.started
+            total = sum(self.requests.values())
+            return {
+                'uptime_s': uptime,
+                'requests': dict(self.requests),
+                'errors': dict(self.errors),
+                'throughput_rps': total / uptime if uptime > 0 else 0.0,
+                'latency_p50_s': {name: _finite(h.quantile(0.5)) for name, h in self.latency.items()},
+                'latency_p99_s': {name: _finite(h.quantile(0.99)) for name, h in self.latency.items()},
+                'mean_batch_size': {name: h.total / h.count for name, h in self.batch_sizes.items() if h.count},
+            }
+
+    def to_prometheus(self):
+        with self._lock:
+            uptime = time.monotonic() - self.started
+            lines = ['# TYPE pricing_uptime_seconds gauge', f'pricing_uptime_seconds {uptime:.3f}',
+                     '# TYPE pricing_requests_total counter']
+            lines += [f'pricing_requests_total{{endpoint="{name}"}} {count}' for name, count in self.requests.items()]
+            lines.append('# TYPE pricing_request_errors_total counter')
+            lines += [f'pricing_request_errors_total{{endpoint="{name}"}} {count}' for name, count in self.errors.items()]
+            lines.append('# TYPE pricing_request_latency_seconds histogram')
+            for name, histogram in self.latency.items():
+                lines += histogram.prometheus_lines('pricing_request_latency_seconds', f'endpoint="{name}"')
+            lines.append('# TYPE pricing_batch_size histogram')
+            for name, histogram in self.batch_sizes.items():
+                lines += histogram.prometheus_lines('pricing_batch_size', f'endpoint="{name}"')
+        return '\n'.join(lines) + '\n'
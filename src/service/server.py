@@ -0,0 +1,256 @@
+import asyncio
+import json
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+from src.greeks.calculate_greeks import black_scholes_greeks, monte_carlo_greeks
+from src.models.black_scholes import black_scholes_vectorized
+from src.models.contracts import CONTRACT_COLUMNS, MC_BLOCK_SIZE
+from src.service.batching import MicroBatcher
+from src.service.metrics import ServiceMetrics
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+
+# Requests arriving within this window are priced together in one vectorized call
+DEFAULT_BATCH_WINDOW = 0.002
+DEFAULT_MAX_BATCH_SIZE = 4096
+DEFAULT_NUM_SIMULATIONS = 10000
+
+# Path count allowed per Monte Carlo request, which bounds the memory any single request can claim
+MAX_NUM_SIMULATIONS = 1_000_000
+
+# Upper bound on the request body, which also caps the size of an explicit batch
+MAX_BODY_BYTES = 16 * 1024 ** 2
+
+class RequestError(ValueError):
+    pass
+
+def _parse_contract(payload, monte_carlo=False):
+
+    # Validate one contract up front so that a bad request cannot fail the batch it would join
+    if not isinstance(payload, dict):
+        raise RequestError("Each contract must be a JSON object.")
+    missing = [name for name in CONTRACT_COLUMNS if name not in payload and name != 'q']
+    if missing:
+        raise RequestError(f"Missing fields: {missing}")
+    option_type = str(payload['type']).capitalize()
+    if option_type not in ('Call', 'Put'):
+        raise RequestError("Invalid option type. Use 'Call' or 'Put'.")
+
+    # Only finite JSON numbers: json.loads also accepts NaN and Infinity, and booleans or numeric strings
+    # would otherwise slip through float() (as would integers too large for a float)
+    values = [payload.get(name, 0) for name in CONTRACT_COLUMNS[1:]]
+    if not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+        raise RequestError("S, K, T, r, sigma and q must be numbers.")
+    try:
+        S, K, T, r, sigma, q = (float(value) for value in values)
+    except OverflowError:
+        raise RequestError("S, K, T, r, sigma and q must be finite numbers.") from None
+    if not all(math.isfinite(value) for value in (S, K, T, r, sigma, q)):
+        raise RequestError("S, K, T, r, sigma and q must be finite numbers.")
+    if S <= 0 or K <= 0 or T <= 0:
+        raise RequestError("S, K, and T must be greater than zero.")
+    if sigma < 0:
+        raise RequestError("Volatility (sigma) must be non-negative.")
+    contract = {'type': option_type, 'S': S, 'K': K, 'T': T, 'r': r, 'sigma': sigma, 'q': q}
+
+    if monte_carlo:
+        # Mirror monte_carlo_greeks' own checks so that no request can make the batch it joins raise
+        if sigma <= 0:
+            raise RequestError("Volatility (sigma) must be greater than zero for Monte Carlo pricing.")
+        num_simulations = payload.get('num_simulations', DEFAULT_NUM_SIMULATIONS)
+        seed = payload.get('seed')
+        if (not isinstance(num_simulations, int) or isinstance(num_simulations, bool)
+                or not 2 <= num_simulations <= MAX_NUM_SIMULATIONS):
+            raise RequestError(f"num_simulations must be an integer between 2 and {MAX_NUM_SIMULATIONS}.")
+        if seed is not None and (not isinstance(seed, int) or seed < 0):
+            raise RequestError("seed must be a non-negative integer.")
+        contract['num_simulations'] = num_simulations
+        contract['seed'] = seed
+    return contract
+
+def _columns(contracts):
+    return [np.array([c['type'] for c in contracts])] + [
+        np.fromiter((c[name] for c in contracts), dtype=float, count=len(contracts)) for name in CONTRACT_COLUMNS[1:]
+    ]
+
+def _json_values(values):
+
+    # JSON has no NaN or infinity (e.g. some Greeks at sigma = 0), so non-finite values become null
+    values = np.atleast_1d(np.asarray(values, dtype=float))
+    return np.where(np.isfinite(values), values, None).tolist()
+
+def price_batch(contracts):
+    prices = black_scholes_vectorized(*_columns(contracts))
+    return [{'price': price} for price in _json_values(prices)]
+
+def greeks_batch(contracts):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        greeks = black_scholes_greeks(*_columns(contracts)).as_dict()
+    columns = {name: _json_values(values) for name, values in greeks.items()}
+    return [{name: values[i] for name, values in columns.items()} for i in range(len(contracts))]
+
+def _monte_carlo_rows(contracts, index, normals, results):
+    estimates, errors = monte_carlo_greeks(*_columns([contracts[i] for i in index]), len(normals),
+                                           random_numbers=normals)
+    prices, std_errors = _json_values(estimates.price), _json_values(errors.price)
+    for row, price, std_error in zip(index, prices, std_errors):
+        results[row] = {'price': price, 'std_error': std_error}
+
+def monte_carlo_batch(contracts):
+
+    # Contracts with the same path count and seed share one set of normals (common random numbers), drawn
+    # exactly as monte_carlo_simulation draws them, so a seeded request gets the same answer whichever
+    # batch it lands in
+    groups = {}
+    for index, contract in enumerate(contracts):
+        groups.setdefault((contract['num_simulations'], contract['seed']), []).append(index)
+
+    results = [None] * len(contracts)
+    for (paths, seed), rows in groups.items():
+        # Seeds are chosen by clients, so they are drawn here rather than persisted in the shared pool
+        normals = np.random.default_rng(seed).standard_normal(paths)
+        block = max(1, MC_BLOCK_SIZE // paths)
+        for start in range(0, len(rows), block):
+            index = rows[start:start + block]
+            try:
+                _monte_carlo_rows(contracts, index, normals, results)
+            except Exception:
+                # Reprice the block row by row so that a failure is reported only to the request behind it
+                for row in index:
+                    try:
+                        _monte_carlo_rows(contracts, [row], normals, results)
+                    except Exception as error:
+                        results[row] = error
+    return results
+
+class PricingService:
+
+    ENDPOINTS = {
+        '/price': (price_batch, False),
+        '/greeks': (greeks_batch, False),
+        '/monte_carlo': (monte_carlo_batch, True),
+    }
+
+    def __init__(self, batch_window=DEFAULT_BATCH_WINDOW, max_batch_size=DEFAULT_MAX_BATCH_SIZE, workers=None):
+        self.metrics = ServiceMetrics()
+
+        # Closed-form batches are cheap and run on the event loop; Monte Carlo runs on worker threads
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pricing')
+        self._batchers = {
+            path: MicroBatcher(process, batch_window, max_batch_size,
+                               executor=self._executor if monte_carlo else None,
+                               on_batch=lambda size, path=path: self.metrics.observe_batch(path, size))
+            for path, (process, monte_carlo) in self.ENDPOINTS.items()
+        }
+
+    async def handle(self, method, path, body):
+        if method == 'GET' and path == '/health':
+            return HTTPStatus.OK, {'status': 'ok'}
+        if method == 'GET' and path == '/metrics':
+            return HTTPStatus.OK, self.metrics.to_prometheus()
+        if method == 'GET' and path == '/stats':
+            return HTTPStatus.OK, self.metrics.snapshot()
+        if path not in self.ENDPOINTS:
+            return HTTPStatus.NOT_FOUND, {'error': f'Unknown endpoint {path}'}
+        if method != 'POST':
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'Use POST with a JSON body.'}
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, {'error': 'Body must be valid JSON.'}
+        process, monte_carlo = self.ENDPOINTS[path]
+        try:
+            # A single contract joins the current micro-batch; a list is already a batch of its own
+            if isinstance(payload, list):
+                contracts = [_parse_contract(item, monte_carlo) for item in payload]
+                if not contracts:
+                    return HTTPStatus.OK, []
+                self.metrics.observe_batch(path, len(contracts))
+                if monte_carlo:
+                    results = await asyncio.get_running_loop().run_in_executor(self._executor, process, contracts)
+                else:
+                    results = process(contracts)
+                failed = next((result for result in results if isinstance(result, Exception)), None)
+                if failed is not None:
+                    raise failed
+                return HTTPStatus.OK, results
+            return HTTPStatus.OK, await self._batchers[path].submit(_parse_contract(payload, monte_carlo))
+        except RequestError as error:
+            return HTTPStatus.BAD_REQUEST, {'error': str(error)}
+
+    async def _serve_connection(self, reader, writer):
+
+        # Minimal HTTP/1.1 with keep-alive: enough for JSON clients and load generators
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get('content-length', 0))
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    status, payload = HTTPStatus.BAD_REQUEST, {'error': 'Invalid Content-Length header.'}
+                    keep_alive = False
+                elif length > MAX_BODY_BYTES:
+                    status, payload = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': 'Request body too large.'}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    start = time.perf_counter()
+                    path = target.split('?', 1)[0]
+                    try:
+                        status, payload = await self.handle(method, path, body)
+                    except Exception as error:
+                        status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(error)}
+                    if path in self.ENDPOINTS:
+                        self.metrics.observe_request(path, time.perf_counter() - start, error=status != HTTPStatus.OK)
+                    connection = headers.get('connection', '').lower()
+                    keep_alive = connection != 'close' and (version == 'HTTP/1.1' or connection == 'keep-alive')
+
+                if isinstance(payload, str):
+                    content, content_type = payload.encode(), 'text/plain; version=0.0.4'
+                else:
+                    content, content_type = json.dumps(payload, allow_nan=False).encode(), 'application/json'
+                writer.write(
+                    f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+                    f'Content-Type: {content_type}\r\n'
+                    f'Content-Length: {len(content)}\r\n'
+                    f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'.encode('latin-1') + content
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+        server = await asyncio.start_server(self._serve_connection, host, port, backlog=1024)
+        if ready is not None:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
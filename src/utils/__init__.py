@@ -1,7 +1,11 @@
-# Importing the UserInput class from user_input module
-from .user_input import UserInput
+# UserInput depends on Streamlit, so it is imported lazily to keep src.utils usable from headless code
+def __getattr__(name):
+    if name == 'UserInput':
+        from .user_input import UserInput
+        return UserInput
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Optionally, you can define the __all__ variable to specify what is exported
 __all__ = [
     'UserInput'
-]
\ No newline at end of file
+]
@@ -0,0 +1,246 @@
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# Opt-in: set OPTIONS_INSTRUMENTATION=1 (or call enable()) to record section timings and call counters.
+# When disabled, section() hands back a shared no-op context and count() returns straight away
+ENV_FLAG = 'OPTIONS_INSTRUMENTATION'
+ENV_OUTPUT = 'OPTIONS_INSTRUMENTATION_OUTPUT'
+
+COUNTERS = ('black_scholes_calls', 'monte_carlo_simulation_calls', 'simulated_paths')
+
+# In a Streamlit app each browser session keeps its own recorder (and on/off switch) in session state
+SESSION_KEY = 'instrumentation'
+
+def _enabled_by_default():
+    return os.environ.get(ENV_FLAG, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+# Number of recorders switched on anywhere in the process. While it is zero, count() and section() return
+# before looking up the current recorder, which keeps instrumented hot paths at a global read when off
+# (a session that ends with its recorder on only costs the others this shortcut, never correctness)
+_enabled_recorders = 0
+_enabled_lock = threading.Lock()
+
+class Recorder:
+
+    def __init__(self, enabled=None):
+        self._enabled = False
+        self.enabled = _enabled_by_default() if enabled is None else enabled
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(COUNTERS, 0)
+        self._sections = []
+        self._active = []
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled):
+        global _enabled_recorders
+        enabled = bool(enabled)
+        with _enabled_lock:
+            if enabled != self._enabled:
+                _enabled_recorders += 1 if enabled else -1
+                self._enabled = enabled
+
+# Recorders are looked up per call: one bound to this thread (background jobs carry their session's
+# recorder, see recording()), else the running Streamlit session's, else the process-wide one used by
+# scripts and the benchmarks
+_default = Recorder()
+_bound = threading.local()
+_tracing_lock = threading.Lock()
+_tracing_sections = 0
+_started_tracing = False
+_disabled_section = nullcontext()
+
+def _session_recorder(create=False):
+    streamlit = sys.modules.get('streamlit')
+    if streamlit is None:
+        return None
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    if create:
+        return streamlit.session_state.setdefault(SESSION_KEY, Recorder())
+    return streamlit.session_state.get(SESSION_KEY)
+
+def session_recorder():
+
+    # The recorder of the current Streamlit session, created (off unless OPTIONS_INSTRUMENTATION is set)
+    # on first use; outside a Streamlit script run this is the process-wide recorder
+    return _session_recorder(create=True) or _default
+
+def current_recorder():
+    recorder = getattr(_bound, 'recorder', None)
+    if recorder is None:
+        recorder = _session_recorder()
+    return recorder or _default
+
+@contextmanager
+def recording(recorder):
+
+    # Attribute everything counted in this thread to the given recorder, e.g. work done by a background
+    # job on behalf of the session that started it
+    previous = getattr(_bound, 'recorder', None)
+    _bound.recorder = recorder
+    try:
+        yield recorder
+    finally:
+        _bound.recorder = previous
+
+def is_enabled():
+    return current_recorder().enabled
+
+def enable():
+    current_recorder().enabled = True
+
+def disable():
+    current_recorder().enabled = False
+
+def reset():
+    recorder = current_recorder()
+    with recorder._lock:
+        for name in recorder._counters:
+            recorder._counters[name] = 0
+        recorder._sections.clear()
+
+def count(name, amount=1):
+    if not _enabled_recorders:
+        return
+    recorder = current_recorder()
+    if not recorder.enabled:
+        return
+    with recorder._lock:
+        recorder._counters[name] = recorder._counters.get(name, 0) + amount
+
+def section(name):
+    if not _enabled_recorders:
+        return _disabled_section
+    recorder = current_recorder()
+    if not recorder.enabled:
+        return _disabled_section
+    return _timed_section(recorder, name)
+
+@contextmanager
+def _traced():
+
+    # Memory tracing is process-wide and slows every allocation, so it only runs while some section
+    # (of any session) is open, and is stopped with the last one unless someone else had started it
+    global _tracing_sections, _started_tracing
+    with _tracing_lock:
+        if _tracing_sections == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        _tracing_sections += 1
+    try:
+        yield
+    finally:
+        with _tracing_lock:
+            _tracing_sections -= 1
+            if _tracing_sections == 0 and _started_tracing:
+                tracemalloc.stop()
+                _started_tracing = False
+
+@contextmanager
+def _timed_section(recorder, name):
+    active = recorder._active
+    with _traced():
+
+        # Sections can nest; before resetting the peak for this one, fold the peak so far into every
+        # enclosing section so their own figures stay correct
+        current, peak = tracemalloc.get_traced_memory()
+        for frame in active:
+            frame['peak'] = max(frame['peak'], peak)
+        tracemalloc.reset_peak()
+        frame = {'name': name, 'baseline': current, 'peak': current}
+        active.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+            active.pop()
+            for outer in active:
+                outer['peak'] = max(outer['peak'], peak)
+            with recorder._lock:
+                recorder._sections.append({
+                    'name': name,
+                    'depth': len(active),
+                    'wall_time_s': elapsed,
+                    'peak_memory_bytes': peak - frame['baseline'],
+                })
+
+def snapshot():
+    recorder = current_recorder()
+    with recorder._lock:
+        return {'sections': [dict(record) for record in recorder._sections], 'counters': dict(recorder._counters)}
+
+def to_json(path=None):
+    text = json.dumps(snapshot(), indent=2)
+    if path is not None:
+        with open(path, 'w') as f:
+            f.write(text)
+    return text
+
+def _escape(label):
+    return label.replace('\\', '\\\\').replace('"', '\\"')
+
+def to_prometheus(path=None):
+
+    # Prometheus text exposition format; repeated sections are summed per name
+    data = snapshot()
+    totals = {}
+    for record in data['sections']:
+        wall, peak, calls = totals.get(record['name'], (0.0, 0, 0))
+        totals[record['name']] = (wall + record['wall_time_s'], max(peak, record['peak_memory_bytes']), calls + 1)
+
+    lines = ['# HELP options_section_seconds_total Wall time spent in each page section.',
+             '# TYPE options_section_seconds_total counter']
+    lines += [f'options_section_seconds_total{{section="{_escape(name)}"}} {wall:.6f}'
+              for name, (wall, _, _) in totals.items()]
+    lines += ['# HELP options_section_peak_memory_bytes Peak traced memory allocated within each section.',
+              '# TYPE options_section_peak_memory_bytes gauge']
+    lines += [f'options_section_peak_memory_bytes{{section="{_escape(name)}"}} {peak}'
+              for name, (_, peak, _) in totals.items()]
+    lines += ['# HELP options_section_runs_total Number of times each section ran.',
+              '# TYPE options_section_runs_total counter']
+    lines += [f'options_section_runs_total{{section="{_escape(name)}"}} {calls}'
+              for name, (_, _, calls) in totals.items()]
+    for name, value in data['counters'].items():
+        lines += [f'# TYPE options_{name}_total counter', f'options_{name}_total {value}']
+    text = '\n'.join(lines) + '\n'
+
+    if path is not None:
+        with open(path, 'w') as f:
+            f.write(text)
+    return text
+
+def export(path):
+
+    # The format follows the extension: .prom/.txt for Prometheus text, anything else as JSON
+    if str(path).endswith(('.prom', '.txt')):
+        return to_prometheus(path)
+    return to_json(path)
+
+def render_sidebar_panel():
+    import pandas as pd
+    import streamlit as st
+
+    data = snapshot()
+    with st.sidebar.expander("Timing", expanded=True):
+        if data['sections']:
+            table = pd.DataFrame([{
+                'Section': '  ' * record['depth'] + record['name'],
+                'Time (ms)': record['wall_time_s'] * 1000,
+                'Peak memory (MiB)': record['peak_memory_bytes'] / 1024 ** 2,
+            } for record in data['sections']])
+            st.dataframe(table.style.format({'Time (ms)': '{:.1f}', 'Peak memory (MiB)': '{:.2f}'}),
+                         hide_index=True)
+        for name, value in data['counters'].items():
+            st.write(f"{name.replace('_', ' ').capitalize()}: {value:,}")
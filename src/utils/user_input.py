@@ -78,6 +78,15 @@ class UserInput:
             help="Number of price paths to simulate; higher values improve accuracy but slow performance"
         ))
 
+        # Get the random seed for Monte Carlo so results are reproducible and reused across the page
+        self.parameters['seed'] = int(st.sidebar.number_input(
+            "Enter the random seed for Monte Carlo:", 
+            value=42, 
+            step=1, 
+            key=f"{prefix}seed",
+            help="Fixes the simulated paths so repeated calculations are reused; change it to draw a new set of paths"
+        ))
+
         # Add a unique key to the button
         if st.sidebar.button("Submit", key=f"{prefix}submit_button"):
             st.success("Parameters submitted successfully!")
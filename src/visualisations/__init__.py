@@ -5,7 +5,8 @@ from src.visualisations.general_plots import (
     plot_time_to_expiration_sensitivity,
     plot_strike_price_sensitivity,
     animate_monte_carlo_simulation,
-    plot_histogram_of_simulated_prices
+    plot_histogram_of_simulated_prices,
+    plot_monte_carlo_convergence
 )
 
 # Importing functions from greeks_plots
@@ -26,6 +27,7 @@ __all__ = [
     'plot_strike_price_sensitivity',
     'animate_monte_carlo_simulation',
     'plot_histogram_of_simulated_prices',
+    'plot_monte_carlo_convergence',
     'plot_first_order_greek',
     'plot_second_order_greek',
     'create_volatility_surface',
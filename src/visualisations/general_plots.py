@@ -2,16 +2,60 @@ import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
 from src.models.black_scholes import black_scholes
-from src.models.monte_carlo import monte_carlo_simulation
-import time 
+from src.models.monte_carlo import monte_carlo_simulation, simulate_option_value_paths
+from src.models.jobs import MonteCarloJob, SweepJob
+from src.visualisations.session_cache import session_figure, show_figure
+from src.visualisations.session_jobs import cancel_session_job, job_figure, session_job, show_job
 
-def plot_price_comparison(S, K, T, r, sigma, option_type="Call", q=0, num_simulations=10000):
+# The path animation draws individual lines up to MAX_DRAWN_PATHS and switches to quantile bands above it
+MAX_DRAWN_PATHS = 50
+MAX_ANIMATED_PATHS = 5000
+
+# Above this many paths the histogram is built from a streaming sketch instead of the raw payoff vector
+HISTOGRAM_SKETCH_THRESHOLD = 2_000_000
+HISTOGRAM_SKETCH_BINS = 4096
+
+# The simulation behind the price comparison and the histogram reports its estimate every this many paths
+DISTRIBUTION_CHUNK_SIZE = 100_000
+
+# The live convergence run refines in the background up to this many paths, reporting every chunk
+CONVERGENCE_MAX_PATHS = 5_000_000
+CONVERGENCE_CHUNK_SIZE = 50_000
+
+def _distribution_job(option_type, S, K, T, r, sigma, q, num_simulations, seed):
+
+    # One background simulation per session serves both the price comparison and the histogram; a seeded
+    # run draws the numbers monte_carlo_simulation would, whatever the chunk size
+    sketch_bins = HISTOGRAM_SKETCH_BINS if num_simulations > HISTOGRAM_SKETCH_THRESHOLD else None
+    inputs = (option_type, S, K, T, r, sigma, q, num_simulations, seed)
+    return session_job('payoff_distribution', inputs, lambda: MonteCarloJob(
+        option_type, S, K, T, r, sigma, q, max_paths=num_simulations,
+        chunk_size=min(num_simulations, DISTRIBUTION_CHUNK_SIZE), seed=seed,
+        keep_payoffs=sketch_bins is None, sketch_bins=sketch_bins))
+
+def plot_price_comparison(S, K, T, r, sigma, option_type="Call", q=0, num_simulations=10000, seed=None):
+    job = _distribution_job(option_type, S, K, T, r, sigma, q, num_simulations, seed)
     bs_price = black_scholes(option_type, S, K, T, r, sigma, q)
-    mc_price = monte_carlo_simulation(option_type, S, K, T, r, sigma, q, num_simulations)
-    
+
+    # The Monte Carlo bar shows the running estimate and its 95% interval until every path is in
+    def render(job):
+        latest = job.latest()
+        if latest is None:
+            st.info("Simulating the first batch of paths...")
+            return
+        num_paths, mc_price, std_error, _ = latest
+        show_figure(_price_comparison_figure(bs_price, mc_price, 1.96 * std_error, option_type, num_paths,
+                                             num_simulations))
+
+    show_job(job, render)
+    st.markdown("---")
+
+@session_figure()
+def _price_comparison_figure(bs_price, mc_price, half_width, option_type, num_paths, num_simulations):
     fig, ax = plt.subplots(figsize=(10, 6))
     bars = ax.bar(['Black-Scholes', 'Monte Carlo'], [bs_price, mc_price], 
                  color=['lightblue', 'orange'])
+    ax.errorbar(1, mc_price, yerr=half_width, color='black', capsize=8)
     
     # Add data labels on top of each bar
     for bar in bars:
@@ -20,67 +64,67 @@ def plot_price_comparison(S, K, T, r, sigma, option_type="Call", q=0, num_simula
                 f'{height:.4f}',
                 ha='center', va='bottom', fontweight='bold')
     
-    ax.set_title(f'Option Price Comparison ({option_type})')
+    title = f'Option Price Comparison ({option_type})'
+    if num_paths < num_simulations:
+        title += f' - {num_paths:,} of {num_simulations:,} paths'
+    ax.set_title(title)
     ax.set_ylabel('Option Price')
     
     # Add percentage difference
     pct_diff = abs(bs_price - mc_price) / bs_price * 100
     plt.figtext(0.57, 0.01, f'Difference: {pct_diff:.2f}%', ha='right', va='bottom', style='italic', fontweight='bold', color='red')
     
-    st.pyplot(fig)
-    plt.close(fig)
-    st.markdown("---")
+    return fig
 
-def plot_volatility_sensitivity(S, K, T, r, option_type="Call", q=0, num_simulations=10000):
-    volatilities = np.linspace(0.1, 1.0, 10)  # Volatility range from 10% to 100%
-    bs_prices = [black_scholes(option_type, S, K, T, r, sigma, q) for sigma in volatilities]
-    mc_prices = [monte_carlo_simulation(option_type, S, K, T, r, sigma, q, num_simulations) for sigma in volatilities]
+def _plot_sensitivity(name, inputs, values, bs_price, mc_price, option_type, title, xlabel):
 
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.plot(volatilities, bs_prices, label='Black-Scholes', marker='o')
-    ax.plot(volatilities, mc_prices, label='Monte Carlo', marker='x')
-    ax.set_title(f'Volatility Sensitivity ({option_type})')
-    ax.set_xlabel('Volatility (σ)')
-    ax.set_ylabel('Option Price')
-    ax.legend()
-    ax.grid()
-    st.pyplot(fig)
-    plt.close(fig)
-    st.markdown("---")
+    # Black-Scholes is drawn at once; the Monte Carlo points fill in as the background sweep reaches them
+    values = tuple(float(value) for value in values)
+    bs_prices = tuple(float(bs_price(value)) for value in values)
+    job = session_job(name, (option_type, *inputs), lambda: SweepJob(mc_price, values))
 
-def plot_time_to_expiration_sensitivity(S, K, r, sigma, option_type="Call", q=0, num_simulations=10000):
-    times = np.linspace(0.01, 1.0, 10)  # Time to expiration from 1 day to 1 year
-    bs_prices = [black_scholes(option_type, S, K, T, r, sigma, q) for T in times]
-    mc_prices = [monte_carlo_simulation(option_type, S, K, T, r, sigma, q, num_simulations) for T in times]
+    def render(job):
+        mc_prices = tuple(float(price) for _, price in job.progress())
+        show_figure(_sensitivity_figure(values, bs_prices, mc_prices, option_type, title, xlabel))
 
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.plot(times, bs_prices, label='Black-Scholes', marker='o')
-    ax.plot(times, mc_prices, label='Monte Carlo', marker='x')
-    ax.set_title(f'Time to Expiration Sensitivity ({option_type})')
-    ax.set_xlabel('Time to Expiration (Years)')
-    ax.set_ylabel('Option Price')
-    ax.legend()
-    ax.grid()
-    st.pyplot(fig)
-    plt.close(fig)
+    show_job(job, render)
     st.markdown("---")
 
-def plot_strike_price_sensitivity(S, T, r, sigma, option_type="Call", q=0, num_simulations=10000):
-    strike_prices = np.linspace(S * 0.5, S * 1.5, 10)  # Strike prices from 50% to 150% of S
-    bs_prices = [black_scholes(option_type, S, K, T, r, sigma, q) for K in strike_prices]
-    mc_prices = [monte_carlo_simulation(option_type, S, K, T, r, sigma, q, num_simulations) for K in strike_prices]
-
+@session_figure()
+def _sensitivity_figure(values, bs_prices, mc_prices, option_type, title, xlabel):
     fig, ax = plt.subplots(figsize=(10, 6))
-    ax.plot(strike_prices, bs_prices, label='Black-Scholes', marker='o')
-    ax.plot(strike_prices, mc_prices, label='Monte Carlo', marker='x')
-    ax.set_title(f'Strike Price Sensitivity ({option_type})')
-    ax.set_xlabel('Strike Price (K)')
+    ax.plot(values, bs_prices, label='Black-Scholes', marker='o')
+    ax.plot(values[:len(mc_prices)], mc_prices, label='Monte Carlo', marker='x')
+    ax.set_title(f'{title} ({option_type})')
+    ax.set_xlabel(xlabel)
     ax.set_ylabel('Option Price')
     ax.legend()
     ax.grid()
-    st.pyplot(fig)
-    plt.close(fig)
-    st.markdown("---")
+    return fig
+
+def plot_volatility_sensitivity(S, K, T, r, option_type="Call", q=0, num_simulations=10000, seed=None):
+    volatilities = np.linspace(0.1, 1.0, 10)  # Volatility range from 10% to 100%
+    _plot_sensitivity(
+        'volatility_sensitivity', (S, K, T, r, q, num_simulations, seed), volatilities,
+        lambda sigma: black_scholes(option_type, S, K, T, r, sigma, q),
+        lambda sigma: monte_carlo_simulation(option_type, S, K, T, r, sigma, q, num_simulations, seed=seed),
+        option_type, 'Volatility Sensitivity', 'Volatility (σ)')
+
+def plot_time_to_expiration_sensitivity(S, K, r, sigma, option_type="Call", q=0, num_simulations=10000, seed=None):
+    times = np.linspace(0.01, 1.0, 10)  # Time to expiration from 1 day to 1 year
+    _plot_sensitivity(
+        'time_to_expiration_sensitivity', (S, K, r, sigma, q, num_simulations, seed), times,
+        lambda T: black_scholes(option_type, S, K, T, r, sigma, q),
+        lambda T: monte_carlo_simulation(option_type, S, K, T, r, sigma, q, num_simulations, seed=seed),
+        option_type, 'Time to Expiration Sensitivity', 'Time to Expiration (Years)')
+
+def plot_strike_price_sensitivity(S, T, r, sigma, option_type="Call", q=0, num_simulations=10000, seed=None):
+    strike_prices = np.linspace(S * 0.5, S * 1.5, 10)  # Strike prices from 50% to 150% of S
+    _plot_sensitivity(
+        'strike_price_sensitivity', (S, T, r, sigma, q, num_simulations, seed), strike_prices,
+        lambda K: black_scholes(option_type, S, K, T, r, sigma, q),
+        lambda K: monte_carlo_simulation(option_type, S, K, T, r, sigma, q, num_simulations, seed=seed),
+        option_type, 'Strike Price Sensitivity', 'Strike Price (K)')
 
 def animate_monte_carlo_simulation(option_type, S, K, T, r, sigma, q=0):
 
@@ -88,49 +132,34 @@ def animate_monte_carlo_simulation(option_type, S, K, T, r, sigma, q=0):
     col1, col2 = st.columns(2)
     
     with col1:
-        num_paths = st.slider("Number of paths", 1, 50, 10)
+        num_paths = st.slider("Number of paths", 1, MAX_ANIMATED_PATHS, 10)
     with col2:
-        if st.button("Generate New Paths"):
-            np.random.seed(int(time.time()))
-    
+        # Keep a per-session seed instead of reseeding the global NumPy state
+        if st.button("Generate New Paths") or "path_seed" not in st.session_state:
+            st.session_state["path_seed"] = np.random.SeedSequence().entropy
+
+    show_figure(_option_value_paths_figure(option_type, S, K, T, r, sigma, q, num_paths, st.session_state["path_seed"]))
+    st.markdown("---")
+
+@session_figure()
+def _option_value_paths_figure(option_type, S, K, T, r, sigma, q, num_paths, seed):
     fig, ax = plt.subplots(figsize=(12, 6))
     
-    # Calculate time steps backwards (from T to 0)
-    dt = T / 365
-    days_to_expiry = np.arange(365, -1, -1)  # From 365 to 0
-    time_to_expiry = days_to_expiry * dt  # Convert to years
-    
-    # Plot option price paths
-    for _ in range(num_paths):
-        # Generate stock price path
-        random_walks = np.random.normal(size=365)
-        stock_prices = np.zeros(366)
-        stock_prices[0] = S
-        
-        # Generate full stock price path
-        for t in range(365):
-            stock_prices[t + 1] = stock_prices[t] * np.exp(
-                (r - q - 0.5 * sigma**2) * dt + 
-                sigma * np.sqrt(dt) * random_walks[t]
-            )
-        
-        # Calculate option prices along the path
-        option_prices = np.zeros(366)
-        for t in range(366):
-            if t == 365:  # At expiration
-                if option_type == "Call":
-                    option_prices[t] = max(stock_prices[t] - K, 0)
-                else:
-                    option_prices[t] = max(K - stock_prices[t], 0)
-            else:
-                # Use Black-Scholes for option price at each point
-                option_prices[t] = black_scholes(
-                    option_type, stock_prices[t], K, time_to_expiry[t], 
-                    r, sigma, q
-                )
-        
-        # Plot option price path
-        ax.plot(days_to_expiry, option_prices, alpha=0.4)
+    # Simulate every path and value the option at every node in one vectorized pass
+    _, _, option_values = simulate_option_value_paths(option_type, S, K, T, r, sigma, q, num_paths, seed=seed)
+    days_to_expiry = np.arange(option_values.shape[1] - 1, -1, -1)  # From 365 to 0
+    
+    if num_paths <= MAX_DRAWN_PATHS:
+        # Plot option price paths
+        ax.plot(days_to_expiry, option_values.T, alpha=0.4)
+    else:
+        # Too many paths to draw individually: show quantile bands plus a decimated sample of paths
+        lower, lower_mid, median, upper_mid, upper = np.percentile(option_values, [5, 25, 50, 75, 95], axis=0)
+        ax.fill_between(days_to_expiry, lower, upper, color='tab:blue', alpha=0.15, label='5th-95th percentile')
+        ax.fill_between(days_to_expiry, lower_mid, upper_mid, color='tab:blue', alpha=0.3, label='25th-75th percentile')
+        ax.plot(days_to_expiry, median, color='tab:blue', linewidth=2, label='Median')
+        sample = np.linspace(0, num_paths - 1, MAX_DRAWN_PATHS).astype(int)
+        ax.plot(days_to_expiry, option_values[sample].T, color='gray', alpha=0.15, linewidth=0.8)
     
     # Add reference lines
     initial_price = black_scholes(option_type, S, K, T, r, sigma, q)
@@ -166,37 +195,53 @@ def animate_monte_carlo_simulation(option_type, S, K, T, r, sigma, q=0):
              horizontalalignment='right',
              bbox=dict(facecolor='white', alpha=0.8, edgecolor='gray'))
     
-    st.pyplot(fig)
-    plt.close(fig)
-    
-    st.markdown("---")
+    return fig
 
-def plot_histogram_of_simulated_prices(option_type, S, K, T, r, sigma, q=0, num_simulations=10000):
+def plot_histogram_of_simulated_prices(option_type, S, K, T, r, sigma, q=0, num_simulations=10000, seed=None):
+    job = _distribution_job(option_type, S, K, T, r, sigma, q, num_simulations, seed)
 
-    dt = T / 365
-    option_prices = np.zeros(num_simulations)
+    # The histogram needs every payoff, so only progress is shown until the simulation completes
+    def render(job):
+        if not job.done:
+            latest = job.latest()
+            num_paths = latest[0] if latest else 0
+            st.progress(num_paths / num_simulations,
+                        text=f"Simulating payoffs: {num_paths:,} of {num_simulations:,} paths")
+            return
+        show_figure(job_figure('payoff_histogram', (job,), lambda: _payoff_histogram_figure(
+            job.result(), option_type, S, K, T, r, sigma, q, num_simulations)))
 
-    for i in range(num_simulations):
-        random_walks = np.random.normal(0, 1, size=365)
-        price_path = S * np.exp(np.cumsum((r - q - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * random_walks))        
-        final_stock_price = price_path[-1]
-        
-        if option_type == "Call":
-            payoff = max(final_stock_price - K, 0)
-        else:  # Put
-            payoff = max(K - final_stock_price, 0)
-        
-        option_prices[i] = np.exp(-r * T) * payoff
+    show_job(job, render)
+    st.markdown("---")
+
+def _payoff_histogram_figure(result, option_type, S, K, T, r, sigma, q, num_simulations):
+
+    # Discounted payoffs from the same simulation that priced the option (a sketch for very large runs)
+    sketch = result.sketch
 
     # Create figure
     fig, ax = plt.subplots(figsize=(12, 6))
     
     # Calculate statistics for setting x-axis limits
-    mean_price = np.mean(option_prices)
-    std_price = np.std(option_prices)
+    if sketch is None:
+        option_prices = result.payoffs
+        mean_price = np.mean(option_prices)
+        std_price = np.std(option_prices)
+        min_price, max_price = np.min(option_prices), np.max(option_prices)
+        upper_limit = np.percentile(option_prices, 99)
+    else:
+        mean_price, std_price = sketch.mean, sketch.std
+        min_price, max_price = sketch.minimum, sketch.maximum
+        upper_limit = sketch.quantile(0.99)
 
     # Plot histogram with focused range
-    ax.hist(option_prices, bins=30, color='skyblue', edgecolor='black', alpha=0.7)
+    if sketch is None:
+        ax.hist(option_prices, bins=30, color='skyblue', edgecolor='black', alpha=0.7)
+    else:
+        # Payoffs beyond the sketch range land in the edge bins instead of being dropped
+        values, weights = sketch.weighted_values()
+        ax.hist(values, bins=30, range=(min_price, max_price), weights=weights,
+                color='skyblue', edgecolor='black', alpha=0.7)
     
     # Add vertical lines
     ax.axvline(x=mean_price, color='red', linestyle='--', label=f'Mean Price: {mean_price:.2f}')
@@ -204,7 +249,7 @@ def plot_histogram_of_simulated_prices(option_type, S, K, T, r, sigma, q=0, num_
     ax.axvline(x=bs_price, color='green', linestyle='--', label=f'Black-Scholes Price: {bs_price:.2f}')
 
     # Set x-axis limits to show the full distribution
-    ax.set_xlim(0, np.percentile(option_prices, 99))  
+    ax.set_xlim(0, upper_limit)  
         
     # Labels and title
     ax.set_title(f'Monte Carlo Simulated {option_type} Option Price Distribution ({num_simulations:,} paths)')
@@ -217,10 +262,62 @@ def plot_histogram_of_simulated_prices(option_type, S, K, T, r, sigma, q=0, num_
     stats_text = (f'Statistics:\n'
                  f'Mean: {mean_price:.4f}\n'
                  f'Std Dev: {std_price:.4f}\n'
-                 f'Min: {np.min(option_prices):.4f}\n'
-                 f'Max: {np.max(option_prices):.4f}')
+                 f'Min: {min_price:.4f}\n'
+                 f'Max: {max_price:.4f}')
+    if sketch is not None and sketch.underflow + sketch.overflow:
+        stats_text += (f'\nOutside sketch range: {sketch.underflow + sketch.overflow:,} '
+                       f'({(sketch.underflow + sketch.overflow) / sketch.count:.2e})')
     plt.figtext(0.71, 0.62, stats_text, fontsize=10, bbox=dict(facecolor='white', alpha=0.8))
     
-    st.pyplot(fig)
-    plt.close(fig)
+    return fig
+
+def plot_monte_carlo_convergence(option_type, S, K, T, r, sigma, q=0, seed=None):
+
+    st.subheader("Monte Carlo Convergence (Live)")
+    col1, col2 = st.columns(2)
+
+    # (Re)start the background run whenever the inputs change; the previous one is cancelled
+    with col1:
+        if st.button("Restart Run"):
+            cancel_session_job('convergence')
+    job = session_job('convergence', (option_type, S, K, T, r, sigma, q, seed), lambda: MonteCarloJob(
+        option_type, S, K, T, r, sigma, q, max_paths=CONVERGENCE_MAX_PATHS, chunk_size=CONVERGENCE_CHUNK_SIZE,
+        seed=seed))
+    with col2:
+        if st.button("Cancel Run", disabled=not job.running):
+            job.cancel()
+
+    def render(job):
+        progress = job.progress()
+        if not progress:
+            st.info("Simulating the first batch of paths...")
+            return
+
+        num_paths, price, std_error, elapsed = progress[-1]
+        half_width = 1.96 * std_error
+        st.metric(f"Monte Carlo estimate ({job.state})", f"{price:.4f} ± {half_width:.4f}",
+                  f"{num_paths:,} paths in {elapsed:.1f}s", delta_color="off")
+
+        # Only redraw when a new chunk has arrived since the last refresh
+        bs_price = black_scholes(option_type, S, K, T, r, sigma, q)
+        show_figure(job_figure('convergence', (job, len(progress)),
+                               lambda: _convergence_figure(progress, bs_price, option_type)))
+
+    show_job(job, render)
     st.markdown("---")
+
+def _convergence_figure(progress, bs_price, option_type):
+    paths, prices, std_errors, _ = (np.array(column) for column in zip(*progress))
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.fill_between(paths, prices - 1.96 * std_errors, prices + 1.96 * std_errors, color='orange', alpha=0.25,
+                    label='95% confidence interval')
+    ax.plot(paths, prices, color='orange', label='Monte Carlo estimate')
+    ax.axhline(bs_price, color='tab:blue', linestyle='--', label=f'Black-Scholes Price: {bs_price:.4f}')
+    ax.set_title(f'Monte Carlo Convergence ({option_type})')
+    ax.set_xlabel('Number of Paths')
+    ax.set_ylabel('Option Price')
+    ax.set_xlim(paths[0], max(paths[-1], paths[0] + 1))
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    return fig
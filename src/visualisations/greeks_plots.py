@@ -1,14 +1,23 @@
-import numpy as np
 import streamlit as st
 import matplotlib.pyplot as plt
-import plotly.graph_objs as go
-from src.greeks.calculate_greeks import calculate_greeks_black_scholes, calculate_greeks_monte_carlo
+from src.greeks.calculate_greeks import (
+    SURFACE_GREEKS,
+    calculate_greek_surfaces,
+    calculate_greeks_black_scholes,
+    calculate_greeks_monte_carlo
+)
+from src.visualisations.session_cache import session_cached, session_figure, show_figure
 
-def plot_first_order_greek(greek, S, K, T, r, sigma, option_type="Call", q=0, num_simulations=10000):
+def plot_first_order_greek(greek, S, K, T, r, sigma, option_type="Call", q=0, num_simulations=10000, seed=None):
+    show_figure(_first_order_greek_figure(greek, S, K, T, r, sigma, option_type, q, num_simulations, seed))
+    st.markdown("---")
+
+@session_figure(maxsize=8)
+def _first_order_greek_figure(greek, S, K, T, r, sigma, option_type, q, num_simulations, seed):
 
     # Calculate Greeks
     first_order_bs, _ = calculate_greeks_black_scholes(option_type, S, K, T, r, sigma, q)
-    first_order_mc, _ = calculate_greeks_monte_carlo(option_type, S, K, T, r, sigma, q, num_simulations)
+    first_order_mc, _ = calculate_greeks_monte_carlo(option_type, S, K, T, r, sigma, q, num_simulations, seed=seed)
     
     # Prepare data for plotting
     bs_value = first_order_bs[greek]
@@ -36,15 +45,18 @@ def plot_first_order_greek(greek, S, K, T, r, sigma, option_type="Call", q=0, nu
     plt.figtext(0.49, 0.01, f'Difference: {pct_diff:.2f}%', 
                 ha='center', va='bottom', fontsize = 12, fontweight= 'bold', style='italic', color='red')
     
-    st.pyplot(fig)
-    plt.close(fig)
+    return fig
+
+def plot_second_order_greek(greek, S, K, T, r, sigma, option_type="Call", q=0, num_simulations=10000, seed=None):
+    show_figure(_second_order_greek_figure(greek, S, K, T, r, sigma, option_type, q, num_simulations, seed))
     st.markdown("---")
 
-def plot_second_order_greek(greek, S, K, T, r, sigma, option_type="Call", q=0, num_simulations=10000):
+@session_figure(maxsize=8)
+def _second_order_greek_figure(greek, S, K, T, r, sigma, option_type, q, num_simulations, seed):
 
     # Calculate Greeks
     _, second_order_bs = calculate_greeks_black_scholes(option_type, S, K, T, r, sigma, q)
-    _, second_order_mc = calculate_greeks_monte_carlo(option_type, S, K, T, r, sigma, q, num_simulations)
+    _, second_order_mc = calculate_greeks_monte_carlo(option_type, S, K, T, r, sigma, q, num_simulations, seed=seed)
     
     # Prepare data for plotting
     bs_value = second_order_bs[greek]
@@ -72,74 +84,20 @@ def plot_second_order_greek(greek, S, K, T, r, sigma, option_type="Call", q=0, n
     plt.figtext(0.49, 0.01, f'Difference: {pct_diff:.2f}%', 
                 ha='center', va='bottom', fontsize = 12, fontweight= 'bold', style='italic', color='red')
     
-    st.pyplot(fig)
-    plt.close(fig)
-    st.markdown("---")
+    return fig
 
-def create_volatility_surface(option_type, S, K, T, r, sigma, q):
+@session_cached(maxsize=2)
+def create_volatility_surface(option_type, S, K, T, r, sigma, q, resolution=50, dtype="float64"):
 
     # Define Greek types
-    greeks = ['Delta', 'Gamma', 'Theta', 'Vega', 'Rho']
-    
-    # Prepare containers for Greeks
-    greek_surfaces = {}
-    
-    # Compute surfaces for each Greek
-    for greek in greeks:
-        # Dynamically determine parameter ranges
-        if greek in ['Delta', 'Gamma', 'Vega']:
-            x_param = np.linspace(S * 0.5, S * 1.5, 50)  # Stock prices
-            y_param = np.linspace(max(0.01, sigma * 0.5), sigma * 1.5, 50)  # Volatilities
-            x_title = 'Stock Price'
-            y_title = 'Volatility'
-            
-            # Calculation function
-            def calc_func(x_val, y_val):
-                return calculate_greeks_black_scholes(
-                    option_type, x_val, K, T, r, y_val, q
-                )[0][greek]
-        
-        elif greek == 'Theta':
-            x_param = np.linspace(0.1, T * 2, 50)  # Time to expiration
-            y_param = np.linspace(S * 0.5, S * 1.5, 50)  # Stock prices
-            x_title = 'Time to Expiration'
-            y_title = 'Stock Price'
-            
-            # Calculation function
-            def calc_func(x_val, y_val):
-                return calculate_greeks_black_scholes(
-                    option_type, y_val, K, x_val, r, sigma, q
-                )[0][greek]
-        
-        elif greek == 'Rho':
-            x_param = np.linspace(max(0.01, r * 0.5), r * 1.5, 50)  # Risk-free rates
-            y_param = np.linspace(S * 0.5, S * 1.5, 50)  # Stock prices
-            x_title = 'Risk-Free Rate'
-            y_title = 'Stock Price'
-            
-            # Calculation function
-            def calc_func(x_val, y_val):
-                return calculate_greeks_black_scholes(
-                    option_type, y_val, K, T, x_val, sigma, q
-                )[0][greek]
-        
-        # Compute Greek values
-        greek_values = []
-        for y_val in y_param:
-            row_values = []
-            for x_val in x_param:
-                row_values.append(calc_func(x_val, y_val))
-            greek_values.append(row_values)
-        
-        # Store the surface
-        greek_surfaces[greek] = {
-            'z': greek_values,
-            'x': x_param,
-            'y': y_param,
-            'x_title': x_title,
-            'y_title': y_title
-        }
+    greeks = SURFACE_GREEKS
     
+    # Precompute every surface in one broadcast pass (float32 halves the figure payload)
+    greek_surfaces = calculate_greek_surfaces(option_type, S, K, T, r, sigma, q, resolution, dtype)
+    
+    # Plotly is only needed for this figure, so it is imported on demand
+    import plotly.graph_objs as go
+
     # Create base figure
     fig = go.Figure()
     
@@ -0,0 +1,80 @@
+import functools
+import inspect
+import io
+
+import matplotlib.pyplot as plt
+import streamlit as st
+from src.models.cache import LRUCache, _freeze
+
+# Rendered section output lives in session state, keyed by the inputs each section actually uses, so a
+# rerun triggered by an unrelated widget replays the stored result instead of recomputing it
+SESSION_KEY = 'section_cache'
+
+# Streamlit downsamples (and re-encodes) any image wider than its content width on every display,
+# so figures are rendered no wider than this to let the cached bytes pass straight through
+MAX_IMAGE_WIDTH = 1460
+
+def _session_cache(name, maxsize):
+    caches = st.session_state.setdefault(SESSION_KEY, {})
+    if name not in caches:
+        caches[name] = LRUCache(maxsize)
+    return caches[name]
+
+def session_cached(maxsize=4):
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        cache_name = f'{func.__module__}.{func.__qualname__}'
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+
+            # Same rules as src.models.cache.memoize: fresh randomness or unhashable inputs are never cached
+            arguments = bound.arguments
+            key = tuple((name, _freeze(value)) for name, value in arguments.items())
+            cacheable = all(frozen is not None or arguments[name] is None for name, frozen in key)
+            if not cacheable or ('seed' in arguments and arguments['seed'] is None):
+                return func(*args, **kwargs)
+
+            cache = _session_cache(cache_name, maxsize)
+            found, value = cache.get(key)
+            if found:
+                return value
+            value = func(*args, **kwargs)
+            cache.put(key, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+def figure_to_png(fig):
+
+    # Like st.pyplot (tight bounding box, up to 200 dpi), but as bytes that can be kept
+    dpi = min(200, MAX_IMAGE_WIDTH / fig.get_figwidth())
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', bbox_inches='tight', dpi=dpi)
+    plt.close(fig)
+    return buffer.getvalue()
+
+def session_figure(maxsize=4):
+
+    # For builders that return a Matplotlib figure: cache the rendered PNG rather than the figure
+    def decorator(func):
+
+        @session_cached(maxsize)
+        @functools.wraps(func)
+        def render(*args, **kwargs):
+            return figure_to_png(func(*args, **kwargs))
+
+        return render
+
+    return decorator
+
+def show_figure(png):
+    st.image(png, width='stretch')
+
+def clear_session_cache():
+    st.session_state.pop(SESSION_KEY, None)
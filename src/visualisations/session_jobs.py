@@ -0,0 +1,54 @@
+import streamlit as st
+from src.visualisations.session_cache import figure_to_png
+
+# Background jobs of a session live in session state, one per name, and are restarted (the previous one
+# cancelled) whenever the inputs they were started for change
+SESSION_KEY = 'background_jobs'
+
+# How often a section with a running job redraws its partial result
+JOB_REFRESH_SECONDS = 0.5
+
+def session_job(name, inputs, create):
+    jobs = st.session_state.setdefault(SESSION_KEY, {})
+    stored = jobs.get(name)
+    if stored is None or stored[0] != inputs:
+        if stored is not None:
+            stored[1].cancel()
+        stored = (inputs, create().start())
+        jobs[name] = stored
+    return stored[1]
+
+def cancel_session_job(name):
+    stored = st.session_state.get(SESSION_KEY, {}).pop(name, None)
+    if stored is not None:
+        stored[1].cancel()
+
+def show_job(job, render, label="Monte Carlo run"):
+
+    # A finished job is drawn once, statically. A running one is drawn by a polling fragment that is only
+    # registered while the job runs, so a finished job (or a section that has been switched off) leaves
+    # nothing rerunning in the background
+    if not job.done:
+        _poll_job(job, render, label)
+    elif job.state == "failed":
+        st.error(f"{label} failed: {job.error}")
+    else:
+        render(job)
+
+@st.fragment(run_every=JOB_REFRESH_SECONDS)
+def _poll_job(job, render, label):
+    if job.done:
+        # One full rerun draws the final result outside this fragment, which stops its timer
+        st.rerun()
+    render(job)
+
+def job_figure(name, key, build):
+
+    # Rendered figure of a job's current result, redrawn only when the key (typically the job and the
+    # number of completed steps) changes between refreshes
+    figures = st.session_state.setdefault(f'{SESSION_KEY}_figures', {})
+    cached = figures.get(name)
+    if cached is None or cached[0] != key:
+        cached = (key, figure_to_png(build()))
+        figures[name] = cached
+    return cached[1]
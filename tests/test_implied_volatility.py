@@ -0,0 +1,27 @@
+import numpy as np
+from src.models.black_scholes import black_scholes_vectorized
+from src.models.implied_volatility import implied_volatility
+
+def test_implied_volatility_reprices_a_random_chain():
+
+    # Round trip over a wide chain: every converged volatility must reproduce its quote
+    rng = np.random.default_rng(2024)
+    size = 10000
+    option_type = np.where(rng.random(size) < 0.5, "Call", "Put")
+    K = rng.uniform(40, 200, size)
+    T = rng.uniform(0.02, 3, size)
+    sigma = rng.uniform(0.05, 1.5, size)
+    price = black_scholes_vectorized(option_type, 100.0, K, T, 0.03, sigma, 0.01)
+
+    result = implied_volatility(option_type, price, 100.0, K, T, 0.03, 0.01)
+    converged = result.converged
+    assert converged[result.valid].all()
+    repriced = black_scholes_vectorized(option_type[converged], 100.0, K[converged], T[converged], 0.03,
+                                        result.volatility[converged], 0.01)
+    assert np.max(np.abs(repriced - price[converged])) < 1e-8
+
+def test_implied_volatility_keeps_a_root_hit_exactly():
+    price = black_scholes_vectorized("Call", 100.0, 64.4658, 0.34795, 0.03, 1.05127, 0.01)
+    result = implied_volatility("Call", price, 100.0, 64.4658, 0.34795, 0.03, 0.01)
+    assert result.converged
+    assert abs(result.volatility - 1.05127) < 1e-6
@@ -0,0 +1,20 @@
+import pytest
+from src.models.path_dependent import floating_lookback_price, lookback_option
+
+@pytest.mark.parametrize("option_type", ["Call", "Put"])
+def test_floating_lookback_matches_goldman_sosin_gatto(option_type):
+
+    # With the bridge-sampled extremes the simulation prices the continuously monitored contract
+    result = lookback_option(option_type, 100, 100, 1.0, 0.05, 0.2, 0.0, num_simulations=40000, num_steps=100,
+                             strike="floating", bridge_correction=True, seed=7)
+    expected = floating_lookback_price(option_type, 100, 1.0, 0.05, 0.2, 0.0)
+    assert abs(result.price - expected) < 4 * result.std_error
+
+def test_floating_lookback_call_buys_at_the_low():
+
+    # Call pays S_T - min, put pays max - S_T: the discretely monitored prices sit below the continuous ones
+    call = lookback_option("Call", 100, 100, 1.0, 0.05, 0.2, 0.0, 20000, 252, strike="floating", seed=1).price
+    put = lookback_option("Put", 100, 100, 1.0, 0.05, 0.2, 0.0, 20000, 252, strike="floating", seed=1).price
+    assert call < floating_lookback_price("Call", 100, 1.0, 0.05, 0.2, 0.0)
+    assert put < floating_lookback_price("Put", 100, 1.0, 0.05, 0.2, 0.0)
+    assert call > put